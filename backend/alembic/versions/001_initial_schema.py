@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 import sqlalchemy as sa
 from alembic import op
+from sqlalchemy.dialects import postgresql
 
 revision: str = "001"
 down_revision: Union[str, None] = None
@@ -16,25 +17,43 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# --- ENUM types ---
+# Created once up front in upgrade(); create_type=False stops every table that
+# references a type from emitting its own CREATE TYPE check.
+antibiotic_category = postgresql.ENUM(
+    "penicillin", "cephalosporin", "carbapenem", "fluoroquinolone",
+    "glycopeptide", "oxazolidinone", "tetracycline", "macrolide",
+    "lincosamide", "polymyxin", "aminoglycoside", "other",
+    name="antibiotic_category", create_type=False,
+)
+agent_type = postgresql.ENUM(
+    "antibacterial", "antifungal", "antiviral", name="agent_type", create_type=False
+)
+pathogen_type = postgresql.ENUM("spectrum", "resistance", name="pathogen_type", create_type=False)
+route = postgresql.ENUM(
+    "IV", "PO", "INHL", "IV/PO", "IV/IM", "IM", "topical", name="route", create_type=False
+)
+weight_type = postgresql.ENUM("actual", "ideal", "adjusted", name="weight_type", create_type=False)
+dialysis_type = postgresql.ENUM("HD", "PD", "CRRT", name="dialysis_type", create_type=False)
+toxicity_category = postgresql.ENUM(
+    "general", "renal", "hepatic", "cardiac", "neurologic",
+    "musculoskeletal", "gi", "skin", "obgyn", "hematologic", "endocrine",
+    name="toxicity_category", create_type=False,
+)
+empiric_tier = postgresql.ENUM(
+    "primary", "severe", "alternative", name="empiric_tier", create_type=False
+)
+
+ENUM_TYPES = (
+    antibiotic_category, agent_type, pathogen_type, route,
+    weight_type, dialysis_type, toxicity_category, empiric_tier,
+)
+
+
 def upgrade() -> None:
-    # --- ENUM types ---
-    antibiotic_category = sa.Enum(
-        "penicillin", "cephalosporin", "carbapenem", "fluoroquinolone",
-        "glycopeptide", "oxazolidinone", "tetracycline", "macrolide",
-        "lincosamide", "polymyxin", "aminoglycoside", "other",
-        name="antibiotic_category",
-    )
-    agent_type = sa.Enum("antibacterial", "antifungal", "antiviral", name="agent_type")
-    pathogen_type = sa.Enum("spectrum", "resistance", name="pathogen_type")
-    route = sa.Enum("IV", "PO", "INHL", "IV/PO", "IV/IM", "IM", "topical", name="route")
-    weight_type = sa.Enum("actual", "ideal", "adjusted", name="weight_type")
-    dialysis_type = sa.Enum("HD", "PD", "CRRT", name="dialysis_type")
-    toxicity_category = sa.Enum(
-        "general", "renal", "hepatic", "cardiac", "neurologic",
-        "musculoskeletal", "gi", "skin", "obgyn", "hematologic", "endocrine",
-        name="toxicity_category",
-    )
-    empiric_tier = sa.Enum("primary", "severe", "alternative", name="empiric_tier")
+    bind = op.get_bind()
+    for enum_type in ENUM_TYPES:
+        enum_type.create(bind, checkfirst=True)
 
     # --- Independent tables ---
 
@@ -239,9 +258,6 @@ def downgrade() -> None:
     op.drop_table("antibiotics")
 
     # Drop ENUM types
-    for enum_name in [
-        "empiric_tier", "toxicity_category", "dialysis_type",
-        "weight_type", "route", "pathogen_type", "agent_type",
-        "antibiotic_category",
-    ]:
-        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
+    bind = op.get_bind()
+    for enum_type in reversed(ENUM_TYPES):
+        enum_type.drop(bind, checkfirst=True)
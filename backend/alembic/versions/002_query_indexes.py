@@ -0,0 +1,43 @@
+"""indexes for hot API query patterns
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # search_by_coverage: filter on pathogen + is_covered, group by antibiotic
+    op.create_index(
+        "ix_coverage_pathogen_covered",
+        "antibiotic_coverage",
+        ["pathogen_id", "is_covered", "antibiotic_id"],
+    )
+    # get_antibiotic / get_dosage_for_crcl: regimens per antibiotic in display order
+    op.create_index(
+        "ix_regimens_ab_sort", "dosage_regimens", ["antibiotic_id", "sort_order"]
+    )
+    # get_dosage_for_crcl: (regimen_id, crcl_range_id) is covered by uq_dosage_value
+    op.create_index("ix_dosage_values_crcl", "dosage_values", ["crcl_range_id"])
+    op.create_index("ix_dialysis_dosages_regimen", "dialysis_dosages", ["regimen_id"])
+    op.create_index("ix_antibiotic_notes_ab", "antibiotic_notes", ["antibiotic_id"])
+    # list_syndromes / get_syndrome
+    op.create_index("ix_empiric_rec_syndrome", "empiric_recommendations", ["syndrome_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_empiric_rec_syndrome", table_name="empiric_recommendations")
+    op.drop_index("ix_antibiotic_notes_ab", table_name="antibiotic_notes")
+    op.drop_index("ix_dialysis_dosages_regimen", table_name="dialysis_dosages")
+    op.drop_index("ix_dosage_values_crcl", table_name="dosage_values")
+    op.drop_index("ix_regimens_ab_sort", table_name="dosage_regimens")
+    op.drop_index("ix_coverage_pathogen_covered", table_name="antibiotic_coverage")
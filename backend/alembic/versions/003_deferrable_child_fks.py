@@ -0,0 +1,56 @@
+"""make child-table foreign keys deferrable for bulk loads
+
+Foreign keys on the tables filled by scripts/migrate_data.py become
+DEFERRABLE INITIALLY IMMEDIATE: enforcement is unchanged for normal
+statements, but a bulk-load transaction can issue
+``SET CONSTRAINTS ALL DEFERRED`` and have them checked once at COMMIT.
+
+Deferrable: antibiotic_coverage, antibiotic_penetration, antibiotic_notes,
+dosage_regimens, dosage_values, dosage_steps, dialysis_dosages,
+toxicities, empiric_recommendations.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, FK column) — constraints carry PostgreSQL's default <table>_<column>_fkey name
+DEFERRABLE_FKS = [
+    ("antibiotic_coverage", "antibiotic_id"),
+    ("antibiotic_coverage", "pathogen_id"),
+    ("antibiotic_penetration", "antibiotic_id"),
+    ("antibiotic_penetration", "site_id"),
+    ("antibiotic_notes", "antibiotic_id"),
+    ("dosage_regimens", "antibiotic_id"),
+    ("dosage_values", "regimen_id"),
+    ("dosage_values", "crcl_range_id"),
+    ("dosage_steps", "dosage_value_id"),
+    ("dialysis_dosages", "regimen_id"),
+    ("toxicities", "antibiotic_id"),
+    ("empiric_recommendations", "syndrome_id"),
+    ("empiric_recommendations", "antibiotic_id"),
+]
+
+
+def upgrade() -> None:
+    for table, column in DEFERRABLE_FKS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER CONSTRAINT {table}_{column}_fkey "
+            "DEFERRABLE INITIALLY IMMEDIATE"
+        )
+
+
+def downgrade() -> None:
+    for table, column in DEFERRABLE_FKS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER CONSTRAINT {table}_{column}_fkey NOT DEFERRABLE"
+        )
@@ -0,0 +1,44 @@
+"""unique (institution, antibiotic, pathogen) coverage overrides
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keep only the newest override per (institution, antibiotic, pathogen) so
+# the constraint can be added to existing data. Plain SQL that SQLite runs
+# too, so tests can exercise it.
+DEDUPE_OVERRIDES_SQL = """
+    DELETE FROM coverage_overrides
+    WHERE id NOT IN (
+        SELECT MAX(id)
+        FROM coverage_overrides
+        GROUP BY institution_id, antibiotic_id, pathogen_id
+    )
+"""
+
+
+def upgrade() -> None:
+    op.execute(DEDUPE_OVERRIDES_SQL)
+    # The constraint's index leads with institution_id, so it also serves the
+    # per-institution override lookups; it is the ON CONFLICT target for
+    # override upserts too
+    op.create_unique_constraint(
+        "uq_coverage_override",
+        "coverage_overrides",
+        ["institution_id", "antibiotic_id", "pathogen_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_coverage_override", "coverage_overrides", type_="unique")
@@ -1,23 +1,28 @@
-from decimal import Decimal
+from types import SimpleNamespace
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import and_, bindparam, delete, false, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, load_only, raiseload, selectinload
 
-from app.core.database import get_db
+from app.api.params import enum_member
+from app.core.cache import cached, etag_response, invalidate, tagged
+from app.core.database import get_db, in_values
+from app.core.reference import ReferenceData, get_reference_data
 from app.models.antibiotic import (
     Antibiotic,
     AntibioticCoverage,
     AntibioticPenetration,
-    CrclRange,
     DialysisDosage,
     DosageRegimen,
     DosageValue,
-    Pathogen,
-    PenetrationSite,
 )
-from app.models.enums import AntibioticCategory, AgentType
+from app.models.enums import (
+    AGENT_TYPE_BY_VALUE,
+    ANTIBIOTIC_CATEGORY_BY_VALUE,
+    DIALYSIS_TYPE_BY_VALUE,
+)
 from app.schemas.antibiotic import (
     AntibioticCreate,
     AntibioticDetail,
@@ -39,47 +44,118 @@ router = APIRouter(prefix="/api/antibiotics", tags=["antibiotics"])
 # ─── List all antibiotics ────────────────────────────────────────
 
 
+# One statement for every filter combination: unset filters bind NULL, so
+# the compiled form (and its cache key) never changes between requests.
+_category_param = bindparam("category", type_=Antibiotic.category.type)
+_agent_type_param = bindparam("agent_type", type_=Antibiotic.agent_type.type)
+_LIST_STMT = (
+    select(Antibiotic)
+    .options(
+        load_only(
+            Antibiotic.id,
+            Antibiotic.name,
+            Antibiotic.generic_name,
+            Antibiotic.category,
+            Antibiotic.agent_type,
+            Antibiotic.generation,
+        ),
+        raiseload("*"),
+    )
+    .where(
+        or_(_category_param.is_(None), Antibiotic.category == _category_param),
+        or_(_agent_type_param.is_(None), Antibiotic.agent_type == _agent_type_param),
+    )
+    .order_by(Antibiotic.id)
+)
+
+
 @router.get("", response_model=list[AntibioticListItem])
+@cached
 async def list_antibiotics(
     category: str | None = None,
     agent_type: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(Antibiotic).order_by(Antibiotic.id)
-    if category:
-        stmt = stmt.where(Antibiotic.category == AntibioticCategory(category))
-    if agent_type:
-        stmt = stmt.where(Antibiotic.agent_type == AgentType(agent_type))
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    result = await db.execute(
+        _LIST_STMT,
+        {
+            "category": (
+                enum_member(ANTIBIOTIC_CATEGORY_BY_VALUE, category, "category")
+                if category else None
+            ),
+            "agent_type": (
+                enum_member(AGENT_TYPE_BY_VALUE, agent_type, "agent_type")
+                if agent_type else None
+            ),
+        },
+    )
+    return [_list_item(ab) for ab in result.scalars()]
+
+
+def _list_item(ab: Antibiotic) -> AntibioticListItem:
+    # Enum columns go out as their values, so nothing is coerced per request
+    return AntibioticListItem.model_construct(
+        id=ab.id,
+        name=ab.name,
+        generic_name=ab.generic_name,
+        category=ab.category.value,
+        agent_type=ab.agent_type.value,
+        generation=ab.generation,
+    )
 
 
 # ─── Get antibiotic detail ───────────────────────────────────────
 
 
 @router.get("/{antibiotic_id}", response_model=AntibioticDetail)
-async def get_antibiotic(antibiotic_id: int, db: AsyncSession = Depends(get_db)):
+async def get_antibiotic(
+    antibiotic_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    return etag_response(request, *await _detail_json(antibiotic_id, db))
+
+
+@cached
+async def _detail_json(antibiotic_id: int, db: AsyncSession) -> tuple[str, bytes]:
+    # Regimens → dosage values → CrCl range arrive pre-sorted in the main query
     stmt = (
         select(Antibiotic)
+        .outerjoin(Antibiotic.regimens)
+        .outerjoin(DosageRegimen.dosage_values)
+        .outerjoin(DosageValue.crcl_range)
         .where(Antibiotic.id == antibiotic_id)
         .options(
-            selectinload(Antibiotic.coverages).selectinload(AntibioticCoverage.pathogen),
-            selectinload(Antibiotic.penetrations).selectinload(AntibioticPenetration.site),
-            selectinload(Antibiotic.regimens).selectinload(DosageRegimen.dosage_values).selectinload(DosageValue.crcl_range),
-            selectinload(Antibiotic.regimens).selectinload(DosageRegimen.dialysis_dosages),
+            selectinload(Antibiotic.coverages),
+            selectinload(Antibiotic.penetrations),
+            contains_eager(Antibiotic.regimens)
+            .contains_eager(DosageRegimen.dosage_values)
+            .contains_eager(DosageValue.crcl_range),
+            contains_eager(Antibiotic.regimens).selectinload(DosageRegimen.dialysis_dosages),
             selectinload(Antibiotic.notes),
         )
+        .order_by(DosageRegimen.sort_order, DosageValue.crcl_range_id)
     )
     result = await db.execute(stmt)
-    ab = result.scalar_one_or_none()
+    ab = result.unique().scalar_one_or_none()
     if not ab:
         raise HTTPException(status_code=404, detail="Antibiotic not found")
 
-    return _build_detail(ab)
+    # The ETag hashes the encoded body, so it changes with any part of it:
+    # child rows and reference names included, not just updated_at
+    detail = _build_detail(ab, await get_reference_data(db))
+    return tagged(orjson.dumps(detail.model_dump(mode="json")))
+
 
+# Stand-in for a pathogen or site added after the reference snapshot loaded;
+# the snapshot is not refreshed, so such rows read as "Unknown" (as in
+# institutions.py) rather than failing the request
+_UNKNOWN = SimpleNamespace(code="Unknown", name="Unknown")
 
-def _build_detail(ab: Antibiotic) -> AntibioticDetail:
-    return AntibioticDetail(
+
+def _build_detail(ab: Antibiotic, ref: ReferenceData) -> AntibioticDetail:
+    # Rows come straight from the DB, so skip Pydantic validation
+    return AntibioticDetail.model_construct(
         id=ab.id,
         name=ab.name,
         generic_name=ab.generic_name,
@@ -89,63 +165,69 @@ def _build_detail(ab: Antibiotic) -> AntibioticDetail:
         notes_for_doctor=ab.notes_for_doctor,
         notes_for_nurse=ab.notes_for_nurse,
         coverages=[
-            CoverageRead(
-                pathogen_code=c.pathogen.code,
-                pathogen_name=c.pathogen.name,
+            CoverageRead.model_construct(
+                pathogen_code=ref.pathogens.get(c.pathogen_id, _UNKNOWN).code,
+                pathogen_name=ref.pathogens.get(c.pathogen_id, _UNKNOWN).name,
                 is_covered=c.is_covered,
             )
             for c in ab.coverages
         ],
         penetrations=[
-            PenetrationRead(site_code=p.site.code, site_name=p.site.name)
-            for p in ab.penetrations
-        ],
-        regimens=[
-            RegimenRead(
-                id=r.id,
-                route=r.route.value,
-                indication=r.indication,
-                dose_descriptor=r.dose_descriptor,
-                is_weight_based=r.is_weight_based,
-                weight_type=r.weight_type.value if r.weight_type else None,
-                is_preferred=r.is_preferred,
-                fixed_duration=r.fixed_duration,
-                preparation_instructions=r.preparation_instructions,
-                notes_for_doctor=r.notes_for_doctor,
-                notes_for_nurse=r.notes_for_nurse,
-                sort_order=r.sort_order,
-                dosage_values=[
-                    DosageValueRead(
-                        crcl_range_label=dv.crcl_range.label,
-                        dose_text=dv.dose_text,
-                        dose_amount=float(dv.dose_amount) if dv.dose_amount else None,
-                        dose_unit=dv.dose_unit,
-                        frequency=dv.frequency,
-                    )
-                    for dv in r.dosage_values
-                ],
-                dialysis_dosages=[
-                    DialysisDosageRead(
-                        dialysis_type=dd.dialysis_type.value,
-                        dose_text=dd.dose_text,
-                        notes=dd.notes,
-                    )
-                    for dd in r.dialysis_dosages
-                ],
+            PenetrationRead.model_construct(
+                site_code=ref.sites.get(p.site_id, _UNKNOWN).code,
+                site_name=ref.sites.get(p.site_id, _UNKNOWN).name,
             )
-            for r in sorted(ab.regimens, key=lambda x: x.sort_order)
+            for p in ab.penetrations
         ],
+        regimens=[_build_regimen(r) for r in ab.regimens],
         notes=[
-            NoteRead(id=n.id, note_type=n.note_type, content=n.content)
+            NoteRead.model_construct(id=n.id, note_type=n.note_type, content=n.content)
             for n in ab.notes
         ],
     )
 
 
+def _build_regimen(r: DosageRegimen) -> RegimenRead:
+    weight_type = r.weight_type
+    return RegimenRead.model_construct(
+        id=r.id,
+        route=r.route.value,
+        indication=r.indication,
+        dose_descriptor=r.dose_descriptor,
+        is_weight_based=r.is_weight_based,
+        weight_type=weight_type.value if weight_type else None,
+        is_preferred=r.is_preferred,
+        fixed_duration=r.fixed_duration,
+        preparation_instructions=r.preparation_instructions,
+        notes_for_doctor=r.notes_for_doctor,
+        notes_for_nurse=r.notes_for_nurse,
+        sort_order=r.sort_order,
+        dosage_values=[
+            DosageValueRead.model_construct(
+                crcl_range_label=dv.crcl_range.label,
+                dose_text=dv.dose_text,
+                dose_amount=float(dv.dose_amount) if dv.dose_amount else None,
+                dose_unit=dv.dose_unit,
+                frequency=dv.frequency,
+            )
+            for dv in r.dosage_values
+        ],
+        dialysis_dosages=[
+            DialysisDosageRead.model_construct(
+                dialysis_type=dd.dialysis_type.value,
+                dose_text=dd.dose_text,
+                notes=dd.notes,
+            )
+            for dd in r.dialysis_dosages
+        ],
+    )
+
+
 # ─── Search by pathogen coverage ─────────────────────────────────
 
 
 @router.get("/search/by-coverage", response_model=list[AntibioticSearchResult])
+@cached
 async def search_by_coverage(
     pathogens: list[str] = Query(default=[], description="Pathogen codes to require coverage for"),
     db: AsyncSession = Depends(get_db),
@@ -153,90 +235,92 @@ async def search_by_coverage(
     """Find antibiotics that cover ALL specified pathogens.
     Replaces the filterAntibiotics() function from script.js.
     """
+    ref = await get_reference_data(db)
     if not pathogens:
         # Return all antibiotics with their coverage summary
-        return await _all_with_coverage(db)
+        return await _search_results(db, ref)
 
-    # Find pathogen IDs
-    pathogen_result = await db.execute(
-        select(Pathogen).where(Pathogen.code.in_(pathogens))
-    )
-    pathogen_objs = pathogen_result.scalars().all()
-    if len(pathogen_objs) != len(pathogens):
-        found = {p.code for p in pathogen_objs}
-        missing = set(pathogens) - found
+    codes = set(pathogens)
+    missing = codes - ref.pathogen_ids.keys()
+    if missing:
         raise HTTPException(status_code=400, detail=f"Unknown pathogen codes: {missing}")
 
-    pathogen_ids = [p.id for p in pathogen_objs]
+    pathogen_ids = [ref.pathogen_ids[code] for code in codes]
 
-    # Find antibiotics that cover ALL specified pathogens
-    stmt = (
-        select(Antibiotic.id)
-        .join(AntibioticCoverage)
+    # Antibiotics that cover ALL specified pathogens. uq_coverage guarantees
+    # one row per (antibiotic, pathogen), so a plain count needs no DISTINCT.
+    matching_ids = (
+        select(AntibioticCoverage.antibiotic_id)
         .where(
-            AntibioticCoverage.pathogen_id.in_(pathogen_ids),
+            in_values(db, AntibioticCoverage.pathogen_id, pathogen_ids),
             AntibioticCoverage.is_covered.is_(True),
         )
-        .group_by(Antibiotic.id)
-        .having(func.count(func.distinct(AntibioticCoverage.pathogen_id)) == len(pathogen_ids))
+        .group_by(AntibioticCoverage.antibiotic_id)
+        .having(func.count() == len(pathogen_ids))
     )
-    result = await db.execute(stmt)
-    matching_ids = [row[0] for row in result.all()]
+    return await _search_results(db, ref, Antibiotic.id.in_(matching_ids))
 
-    if not matching_ids:
-        return []
 
-    # Fetch full details for matching antibiotics
+async def _search_results(
+    db: AsyncSession, ref: ReferenceData, *criteria
+) -> list[AntibioticSearchResult]:
+    """Build search results from one flat joined statement.
+
+    Each row carries one (covered pathogen, penetration site) id pair; ids
+    are folded back per antibiotic and resolved to codes from the
+    reference snapshot instead of joining the lookup tables.
+    """
     stmt = (
-        select(Antibiotic)
-        .where(Antibiotic.id.in_(matching_ids))
-        .options(
-            selectinload(Antibiotic.coverages).selectinload(AntibioticCoverage.pathogen),
-            selectinload(Antibiotic.penetrations).selectinload(AntibioticPenetration.site),
+        select(
+            Antibiotic.id,
+            Antibiotic.name,
+            Antibiotic.generic_name,
+            Antibiotic.category,
+            Antibiotic.agent_type,
+            Antibiotic.generation,
+            AntibioticCoverage.pathogen_id,
+            AntibioticPenetration.site_id,
         )
-        .order_by(Antibiotic.id)
+        .outerjoin(
+            AntibioticCoverage,
+            and_(
+                AntibioticCoverage.antibiotic_id == Antibiotic.id,
+                AntibioticCoverage.is_covered.is_(True),
+            ),
+        )
+        .outerjoin(AntibioticPenetration, AntibioticPenetration.antibiotic_id == Antibiotic.id)
+        .where(*criteria)
+        .order_by(Antibiotic.id, AntibioticCoverage.id, AntibioticPenetration.id)
     )
     result = await db.execute(stmt)
-    antibiotics = result.scalars().all()
-
-    return [
-        AntibioticSearchResult(
-            id=ab.id,
-            name=ab.name,
-            generic_name=ab.generic_name,
-            category=ab.category.value,
-            agent_type=ab.agent_type.value,
-            generation=ab.generation,
-            covered_pathogens=[c.pathogen.code for c in ab.coverages if c.is_covered],
-            penetration_sites=[p.site.code for p in ab.penetrations],
-        )
-        for ab in antibiotics
-    ]
 
+    antibiotics: dict[int, tuple] = {}
+    covered: dict[int, dict[int, None]] = {}
+    sites: dict[int, dict[int, None]] = {}
+    for ab_id, name, generic_name, category, agent_type, generation, pathogen_id, site_id in result:
+        if ab_id not in antibiotics:
+            antibiotics[ab_id] = (name, generic_name, category, agent_type, generation)
+            covered[ab_id] = {}
+            sites[ab_id] = {}
+        if pathogen_id is not None:
+            covered[ab_id][pathogen_id] = None
+        if site_id is not None:
+            sites[ab_id][site_id] = None
 
-async def _all_with_coverage(db: AsyncSession) -> list[AntibioticSearchResult]:
-    stmt = (
-        select(Antibiotic)
-        .options(
-            selectinload(Antibiotic.coverages).selectinload(AntibioticCoverage.pathogen),
-            selectinload(Antibiotic.penetrations).selectinload(AntibioticPenetration.site),
-        )
-        .order_by(Antibiotic.id)
-    )
-    result = await db.execute(stmt)
-    antibiotics = result.scalars().all()
     return [
         AntibioticSearchResult(
-            id=ab.id,
-            name=ab.name,
-            generic_name=ab.generic_name,
-            category=ab.category.value,
-            agent_type=ab.agent_type.value,
-            generation=ab.generation,
-            covered_pathogens=[c.pathogen.code for c in ab.coverages if c.is_covered],
-            penetration_sites=[p.site.code for p in ab.penetrations],
+            id=ab_id,
+            name=name,
+            generic_name=generic_name,
+            category=category.value,
+            agent_type=agent_type.value,
+            generation=generation,
+            covered_pathogens=[
+                ref.pathogens.get(pid, _UNKNOWN).code for pid in covered[ab_id]
+            ],
+            penetration_sites=[ref.sites.get(sid, _UNKNOWN).code for sid in sites[ab_id]],
         )
-        for ab in antibiotics
+        for ab_id, (name, generic_name, category, agent_type, generation) in antibiotics.items()
     ]
 
 
@@ -244,128 +328,115 @@ async def _all_with_coverage(db: AsyncSession) -> list[AntibioticSearchResult]:
 
 
 @router.get("/{antibiotic_id}/dosage", response_model=DosageForCrclResponse)
+@cached
 async def get_dosage_for_crcl(
     antibiotic_id: int,
     crcl: float | None = Query(default=None, description="CrCl value in ml/min"),
     dialysis: str | None = Query(default=None, description="Dialysis type: HD, PD, or CRRT"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get dosage recommendations for a specific CrCl value or dialysis mode."""
-    ab = await db.get(Antibiotic, antibiotic_id)
-    if not ab:
-        raise HTTPException(status_code=404, detail="Antibiotic not found")
-
-    # Load regimens with dosage values and dialysis dosages
-    stmt = (
-        select(DosageRegimen)
-        .where(DosageRegimen.antibiotic_id == antibiotic_id)
-        .options(
-            selectinload(DosageRegimen.dosage_values).selectinload(DosageValue.crcl_range),
-            selectinload(DosageRegimen.dialysis_dosages),
-        )
-        .order_by(DosageRegimen.sort_order)
-    )
-    result = await db.execute(stmt)
-    regimens = result.scalars().all()
+    """Get dosage recommendations for a specific CrCl value or dialysis mode.
 
+    The antibiotic is the driving table of a LEFT JOIN, so its name (and the
+    404 check) comes back with the dosage rows in a single statement.
+    """
     if dialysis:
         # Return dialysis-specific dosages
-        dial_dosages = []
-        for r in regimens:
-            for dd in r.dialysis_dosages:
-                if dd.dialysis_type.value == dialysis:
-                    dial_dosages.append(DialysisDosageRead(
-                        dialysis_type=dd.dialysis_type.value,
-                        dose_text=dd.dose_text,
-                        notes=dd.notes,
-                    ))
-
-        return DosageForCrclResponse(
-            antibiotic_name=ab.name,
+        dialysis_type = DIALYSIS_TYPE_BY_VALUE.get(dialysis)
+        if dialysis_type is not None:
+            type_matches = DialysisDosage.dialysis_type == dialysis_type
+        else:
+            type_matches = false()
+        result = await db.execute(
+            select(Antibiotic.name, DialysisDosage)
+            .outerjoin(DosageRegimen, DosageRegimen.antibiotic_id == Antibiotic.id)
+            .outerjoin(
+                DialysisDosage,
+                and_(DialysisDosage.regimen_id == DosageRegimen.id, type_matches),
+            )
+            .where(Antibiotic.id == antibiotic_id)
+            .order_by(DosageRegimen.sort_order, DialysisDosage.id)
+        )
+        rows = result.all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="Antibiotic not found")
+
+        return DosageForCrclResponse.model_construct(
+            antibiotic_name=rows[0][0],
             crcl_value=None,
             crcl_range_label=dialysis,
             is_dialysis=True,
             regimens=[],
-            dialysis_dosages=dial_dosages,
+            dialysis_dosages=[
+                DialysisDosageRead.model_construct(
+                    dialysis_type=dd.dialysis_type.value,
+                    dose_text=dd.dose_text,
+                    notes=dd.notes,
+                )
+                for _, dd in rows
+                if dd is not None
+            ],
         )
 
     # Determine CrCl range
-    crcl_range = await _resolve_crcl_range(db, crcl)
+    crcl_range = (await get_reference_data(db)).crcl_ranges.resolve(crcl)
 
-    # Filter dosage values for matching CrCl range
-    filtered_regimens = []
-    for r in regimens:
-        matching_values = [
-            DosageValueRead(
-                crcl_range_label=dv.crcl_range.label,
-                dose_text=dv.dose_text,
-                dose_amount=float(dv.dose_amount) if dv.dose_amount else None,
-                dose_unit=dv.dose_unit,
-                frequency=dv.frequency,
-            )
-            for dv in r.dosage_values
-            if dv.crcl_range_id == crcl_range.id
-        ]
-        if matching_values:
-            filtered_regimens.append(RegimenRead(
-                id=r.id,
-                route=r.route.value,
-                indication=r.indication,
-                dose_descriptor=r.dose_descriptor,
-                is_weight_based=r.is_weight_based,
-                weight_type=r.weight_type.value if r.weight_type else None,
-                is_preferred=r.is_preferred,
-                fixed_duration=r.fixed_duration,
-                preparation_instructions=r.preparation_instructions,
-                notes_for_doctor=r.notes_for_doctor,
-                notes_for_nurse=r.notes_for_nurse,
-                sort_order=r.sort_order,
-                dosage_values=matching_values,
-                dialysis_dosages=[],
-            ))
-
-    return DosageForCrclResponse(
-        antibiotic_name=ab.name,
-        crcl_value=crcl,
-        crcl_range_label=crcl_range.label,
-        is_dialysis=False,
-        regimens=filtered_regimens,
-        dialysis_dosages=[],
-    )
-
-
-async def _resolve_crcl_range(db: AsyncSession, crcl: float | None) -> CrclRange:
-    """Find the CrCl range for a given value. Boundary rule: value takes the higher range."""
-    if crcl is None or crcl > 90:
-        # Normal renal function
-        result = await db.execute(
-            select(CrclRange).where(CrclRange.label == "Normal")
-        )
-        return result.scalar_one()
-
-    # Find matching range: CrCl value takes the higher range at boundaries
-    # e.g., CrCl=50 → "50~60" range (upper_bound-based matching)
+    # Regimens paired with their dosage value for the matching CrCl range
+    # (uq_dosage_value: at most one value per regimen and range)
     result = await db.execute(
-        select(CrclRange)
-        .where(
-            CrclRange.lower_bound.isnot(None),
-            CrclRange.lower_bound <= Decimal(str(crcl)),
+        select(Antibiotic.name, DosageRegimen, DosageValue)
+        .outerjoin(DosageRegimen, DosageRegimen.antibiotic_id == Antibiotic.id)
+        .outerjoin(
+            DosageValue,
+            and_(
+                DosageValue.regimen_id == DosageRegimen.id,
+                DosageValue.crcl_range_id == crcl_range.id,
+            ),
         )
-        .order_by(CrclRange.sort_order.desc())
+        .where(Antibiotic.id == antibiotic_id)
+        .order_by(DosageRegimen.sort_order)
     )
-    ranges = result.scalars().all()
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Antibiotic not found")
 
-    for r in ranges:
-        if r.upper_bound is not None and crcl <= float(r.upper_bound):
-            return r
-        if r.upper_bound is None:
-            return r
+    filtered_regimens = [
+        RegimenRead.model_construct(
+            id=r.id,
+            route=r.route.value,
+            indication=r.indication,
+            dose_descriptor=r.dose_descriptor,
+            is_weight_based=r.is_weight_based,
+            weight_type=r.weight_type.value if r.weight_type else None,
+            is_preferred=r.is_preferred,
+            fixed_duration=r.fixed_duration,
+            preparation_instructions=r.preparation_instructions,
+            notes_for_doctor=r.notes_for_doctor,
+            notes_for_nurse=r.notes_for_nurse,
+            sort_order=r.sort_order,
+            dosage_values=[
+                DosageValueRead.model_construct(
+                    crcl_range_label=crcl_range.label,
+                    dose_text=dv.dose_text,
+                    dose_amount=float(dv.dose_amount) if dv.dose_amount else None,
+                    dose_unit=dv.dose_unit,
+                    frequency=dv.frequency,
+                )
+            ],
+            dialysis_dosages=[],
+        )
+        for _, r, dv in rows
+        if dv is not None
+    ]
 
-    # Fallback: <5 range
-    result = await db.execute(
-        select(CrclRange).where(CrclRange.label == "<5")
+    return DosageForCrclResponse.model_construct(
+        antibiotic_name=rows[0][0],
+        crcl_value=crcl,
+        crcl_range_label=crcl_range.label,
+        is_dialysis=False,
+        regimens=filtered_regimens,
+        dialysis_dosages=[],
     )
-    return result.scalar_one()
 
 
 # ─── Create antibiotic ───────────────────────────────────────────
@@ -379,16 +450,16 @@ async def create_antibiotic(
     ab = Antibiotic(
         name=data.name,
         generic_name=data.generic_name,
-        category=AntibioticCategory(data.category),
-        agent_type=AgentType(data.agent_type),
+        category=enum_member(ANTIBIOTIC_CATEGORY_BY_VALUE, data.category, "category"),
+        agent_type=enum_member(AGENT_TYPE_BY_VALUE, data.agent_type, "agent_type"),
         generation=data.generation,
         notes_for_doctor=data.notes_for_doctor,
         notes_for_nurse=data.notes_for_nurse,
     )
     db.add(ab)
     await db.commit()
-    await db.refresh(ab)
-    return ab
+    invalidate()
+    return _list_item(ab)
 
 
 # ─── Update antibiotic ──────────────────────────────────────────
@@ -400,22 +471,33 @@ async def update_antibiotic(
     data: AntibioticUpdate,
     db: AsyncSession = Depends(get_db),
 ):
-    ab = await db.get(Antibiotic, antibiotic_id)
-    if not ab:
-        raise HTTPException(status_code=404, detail="Antibiotic not found")
-
     update_data = data.model_dump(exclude_unset=True)
     if "category" in update_data:
-        update_data["category"] = AntibioticCategory(update_data["category"])
+        update_data["category"] = enum_member(
+            ANTIBIOTIC_CATEGORY_BY_VALUE, update_data["category"], "category"
+        )
     if "agent_type" in update_data:
-        update_data["agent_type"] = AgentType(update_data["agent_type"])
+        update_data["agent_type"] = enum_member(
+            AGENT_TYPE_BY_VALUE, update_data["agent_type"], "agent_type"
+        )
 
-    for key, value in update_data.items():
-        setattr(ab, key, value)
+    # UPDATE ... RETURNING doubles as the existence check
+    if update_data:
+        stmt = (
+            update(Antibiotic)
+            .where(Antibiotic.id == antibiotic_id)
+            .values(**update_data)
+            .returning(Antibiotic)
+        )
+    else:
+        stmt = select(Antibiotic).where(Antibiotic.id == antibiotic_id)
+    ab = (await db.execute(stmt)).scalar_one_or_none()
+    if not ab:
+        raise HTTPException(status_code=404, detail="Antibiotic not found")
 
     await db.commit()
-    await db.refresh(ab)
-    return ab
+    invalidate()
+    return _list_item(ab)
 
 
 # ─── Delete antibiotic ──────────────────────────────────────────
@@ -426,9 +508,12 @@ async def delete_antibiotic(
     antibiotic_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    ab = await db.get(Antibiotic, antibiotic_id)
-    if not ab:
+    # Child rows go via ON DELETE CASCADE; RETURNING doubles as the existence check
+    result = await db.execute(
+        delete(Antibiotic).where(Antibiotic.id == antibiotic_id).returning(Antibiotic.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Antibiotic not found")
 
-    await db.delete(ab)
     await db.commit()
+    invalidate()
@@ -1,15 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.params import enum_member
+from app.core.cache import cached, invalidate
 from app.core.database import get_db
 from app.models.antibiotic import (
     Antibiotic,
     EmpiricRecommendation,
     EmpiricSyndrome,
 )
-from app.models.enums import EmpiricTier
+from app.models.enums import EMPIRIC_TIER_BY_VALUE
 from app.schemas.empiric import (
     EmpiricRecommendationCreate,
     EmpiricRecommendationRead,
@@ -21,35 +22,22 @@ router = APIRouter(prefix="/api/empiric", tags=["empiric"])
 
 
 @router.get("", response_model=list[EmpiricSyndromeRead])
+@cached
 async def list_syndromes(db: AsyncSession = Depends(get_db)):
-    stmt = (
-        select(EmpiricSyndrome)
-        .options(
-            selectinload(EmpiricSyndrome.recommendations)
-            .selectinload(EmpiricRecommendation.antibiotic)
-        )
-        .order_by(EmpiricSyndrome.id)
-    )
-    result = await db.execute(stmt)
-    syndromes = result.scalars().all()
-    return [_build_syndrome(s) for s in syndromes]
+    result = await db.execute(_syndrome_rows_stmt())
+    return _group_syndromes(result)
 
 
 @router.get("/{syndrome_id}", response_model=EmpiricSyndromeRead)
+@cached
 async def get_syndrome(syndrome_id: int, db: AsyncSession = Depends(get_db)):
-    stmt = (
-        select(EmpiricSyndrome)
-        .where(EmpiricSyndrome.id == syndrome_id)
-        .options(
-            selectinload(EmpiricSyndrome.recommendations)
-            .selectinload(EmpiricRecommendation.antibiotic)
-        )
+    result = await db.execute(
+        _syndrome_rows_stmt().where(EmpiricSyndrome.id == syndrome_id)
     )
-    result = await db.execute(stmt)
-    syndrome = result.scalar_one_or_none()
-    if not syndrome:
+    syndromes = _group_syndromes(result)
+    if not syndromes:
         raise HTTPException(status_code=404, detail="Syndrome not found")
-    return _build_syndrome(syndrome)
+    return syndromes[0]
 
 
 @router.post("", response_model=EmpiricSyndromeRead, status_code=201)
@@ -60,8 +48,10 @@ async def create_syndrome(
     syndrome = EmpiricSyndrome(name=data.name)
     db.add(syndrome)
     await db.commit()
-    await db.refresh(syndrome)
-    return EmpiricSyndromeRead(id=syndrome.id, name=syndrome.name, recommendations=[])
+    invalidate()
+    return EmpiricSyndromeRead.model_construct(
+        id=syndrome.id, name=syndrome.name, recommendations=[]
+    )
 
 
 @router.post("/{syndrome_id}/recommendations", status_code=201)
@@ -81,12 +71,13 @@ async def add_recommendation(
     rec = EmpiricRecommendation(
         syndrome_id=syndrome_id,
         antibiotic_id=data.antibiotic_id,
-        tier=EmpiricTier(data.tier),
+        tier=enum_member(EMPIRIC_TIER_BY_VALUE, data.tier, "tier"),
         is_addon=data.is_addon,
         addon_notes=data.addon_notes,
     )
     db.add(rec)
     await db.commit()
+    invalidate()
     return {"status": "created"}
 
 
@@ -97,20 +88,45 @@ async def delete_syndrome(syndrome_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Syndrome not found")
     await db.delete(syndrome)
     await db.commit()
+    invalidate()
+
+
+def _syndrome_rows_stmt():
+    """One row per recommendation (or one bare row for an empty syndrome)."""
+    return (
+        select(
+            EmpiricSyndrome.id,
+            EmpiricSyndrome.name,
+            EmpiricRecommendation.antibiotic_id,
+            Antibiotic.name,
+            EmpiricRecommendation.tier,
+            EmpiricRecommendation.is_addon,
+            EmpiricRecommendation.addon_notes,
+        )
+        .select_from(EmpiricSyndrome)
+        .outerjoin(EmpiricRecommendation)
+        .outerjoin(Antibiotic, Antibiotic.id == EmpiricRecommendation.antibiotic_id)
+        .order_by(EmpiricSyndrome.id, EmpiricRecommendation.id)
+    )
 
 
-def _build_syndrome(s: EmpiricSyndrome) -> EmpiricSyndromeRead:
-    return EmpiricSyndromeRead(
-        id=s.id,
-        name=s.name,
-        recommendations=[
-            EmpiricRecommendationRead(
-                antibiotic_id=r.antibiotic_id,
-                antibiotic_name=r.antibiotic.name,
-                tier=r.tier.value,
-                is_addon=r.is_addon,
-                addon_notes=r.addon_notes,
+def _group_syndromes(rows) -> list[EmpiricSyndromeRead]:
+    # Rows come straight from the DB, so skip Pydantic validation
+    syndromes: dict[int, EmpiricSyndromeRead] = {}
+    for syndrome_id, name, antibiotic_id, antibiotic_name, tier, is_addon, addon_notes in rows:
+        syndrome = syndromes.get(syndrome_id)
+        if syndrome is None:
+            syndrome = syndromes[syndrome_id] = EmpiricSyndromeRead.model_construct(
+                id=syndrome_id, name=name, recommendations=[]
             )
-            for r in s.recommendations
-        ],
-    )
+        if antibiotic_id is not None:
+            syndrome.recommendations.append(
+                EmpiricRecommendationRead.model_construct(
+                    antibiotic_id=antibiotic_id,
+                    antibiotic_name=antibiotic_name,
+                    tier=tier.value,
+                    is_addon=is_addon,
+                    addon_notes=addon_notes,
+                )
+            )
+    return list(syndromes.values())
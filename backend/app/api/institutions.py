@@ -1,18 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import bindparam, delete, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from app.core.database import get_db
+from app.core.cache import cached, etag_response, invalidate, tagged
+from app.core.database import get_conn, get_db, upsert
+from app.core.reference import get_reference_data
 from app.models.antibiotic import (
     Antibiotic,
     CoverageOverride,
     Institution,
-    Pathogen,
 )
 from app.schemas.institution import (
     CoverageOverrideCreate,
-    CoverageOverrideRead,
     InstitutionCreate,
     InstitutionDetail,
     InstitutionRead,
@@ -20,65 +20,122 @@ from app.schemas.institution import (
 
 router = APIRouter(prefix="/api/institutions", tags=["institutions"])
 
+# Built once at import; requests only bind parameters, so the compiled form
+# is reused from the engine's statement cache
 
-@router.get("", response_model=list[InstitutionRead])
-async def list_institutions(db: AsyncSession = Depends(get_db)):
-    stmt = (
-        select(
-            Institution,
-            func.count(CoverageOverride.id).label("override_count"),
-        )
-        .outerjoin(CoverageOverride)
-        .group_by(Institution.id)
-        .order_by(Institution.id)
+_override_count = (
+    select(func.count(CoverageOverride.id))
+    .where(CoverageOverride.institution_id == Institution.id)
+    .scalar_subquery()
+)
+_LIST_STMT = (
+    select(
+        Institution.id,
+        Institution.name,
+        Institution.code,
+        _override_count.label("override_count"),
     )
-    result = await db.execute(stmt)
-    rows = result.all()
-    return [
-        InstitutionRead(
-            id=inst.id, name=inst.name, code=inst.code, override_count=count
-        )
-        for inst, count in rows
-    ]
+    .order_by(Institution.id)
+)
+
+_SUMMARY_STMT = _LIST_STMT.where(Institution.id == bindparam("institution_id"))
+
+# Antibiotic names come from one join; pathogen codes from the in-process
+# reference snapshot
+_OVERRIDES_STMT = (
+    select(
+        CoverageOverride.id,
+        CoverageOverride.antibiotic_id,
+        Antibiotic.name,
+        CoverageOverride.pathogen_id,
+        CoverageOverride.is_covered,
+    )
+    .outerjoin(Antibiotic, Antibiotic.id == CoverageOverride.antibiotic_id)
+    .where(CoverageOverride.institution_id == bindparam("institution_id"))
+    .order_by(CoverageOverride.id)
+)
+
+
+# Reads return cached, pre-encoded JSON with an ETag; the response models
+# only document the shape. Every write below calls invalidate().
+
+
+@router.get("", response_model=list[InstitutionRead])
+async def list_institutions(
+    request: Request, conn: AsyncConnection = Depends(get_conn)
+):
+    return etag_response(request, *await _institutions_json(conn))
+
+
+@cached
+async def _institutions_json(conn: AsyncConnection) -> tuple[str, bytes]:
+    result = await conn.execute(_LIST_STMT)
+    return tagged(orjson.dumps([dict(row) for row in result.mappings()]))
 
 
 @router.get("/{institution_id}", response_model=InstitutionDetail)
-async def get_institution(institution_id: int, db: AsyncSession = Depends(get_db)):
+async def get_institution(
+    institution_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    return etag_response(request, *await _institution_json(institution_id, db))
+
+
+@cached
+async def _institution_json(institution_id: int, db: AsyncSession) -> tuple[str, bytes]:
     inst = await db.get(Institution, institution_id)
     if not inst:
         raise HTTPException(status_code=404, detail="Institution not found")
 
-    stmt = (
-        select(CoverageOverride)
-        .where(CoverageOverride.institution_id == institution_id)
-        .options(
-            selectinload(CoverageOverride.institution),
-        )
-    )
-    result = await db.execute(stmt)
-    overrides = result.scalars().all()
-
-    # Load antibiotic and pathogen names for each override
-    override_reads = []
-    for o in overrides:
-        ab = await db.get(Antibiotic, o.antibiotic_id)
-        pathogen = await db.get(Pathogen, o.pathogen_id)
-        override_reads.append(CoverageOverrideRead(
-            id=o.id,
-            antibiotic_id=o.antibiotic_id,
-            antibiotic_name=ab.name if ab else "Unknown",
-            pathogen_id=o.pathogen_id,
-            pathogen_code=pathogen.code if pathogen else "Unknown",
-            is_covered=o.is_covered,
-        ))
-
-    return InstitutionDetail(
-        id=inst.id,
-        name=inst.name,
-        code=inst.code,
-        override_count=len(override_reads),
-        overrides=override_reads,
+    pathogens = (await get_reference_data(db)).pathogens
+
+    # Stream overrides off a server-side cursor rather than buffering the
+    # whole result; the payload is then encoded once
+    result = await db.stream(
+        _OVERRIDES_STMT.execution_options(yield_per=500),
+        {"institution_id": institution_id},
     )
+    overrides: list[dict] = []
+    async for override_id, antibiotic_id, antibiotic_name, pathogen_id, is_covered in result:
+        pathogen = pathogens.get(pathogen_id)
+        overrides.append({
+            "id": override_id,
+            "antibiotic_id": antibiotic_id,
+            "antibiotic_name": antibiotic_name or "Unknown",
+            "pathogen_id": pathogen_id,
+            "pathogen_code": pathogen.code if pathogen else "Unknown",
+            "is_covered": is_covered,
+        })
+
+    return tagged(orjson.dumps({
+        "id": inst.id,
+        "name": inst.name,
+        "code": inst.code,
+        "override_count": len(overrides),
+        "overrides": overrides,
+    }))
+
+
+@router.get("/{institution_id}/summary", response_model=InstitutionRead)
+async def get_institution_summary(
+    institution_id: int,
+    request: Request,
+    conn: AsyncConnection = Depends(get_conn),
+):
+    """Institution with its override count only, for clients that don't need the list."""
+    return etag_response(request, *await _institution_summary_json(institution_id, conn))
+
+
+@cached
+async def _institution_summary_json(
+    institution_id: int, conn: AsyncConnection
+) -> tuple[str, bytes]:
+    result = await conn.execute(_SUMMARY_STMT, {"institution_id": institution_id})
+    row = result.mappings().one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Institution not found")
+    return tagged(orjson.dumps(dict(row)))
 
 
 @router.post("", response_model=InstitutionRead, status_code=201)
@@ -89,8 +146,10 @@ async def create_institution(
     inst = Institution(name=data.name, code=data.code)
     db.add(inst)
     await db.commit()
-    await db.refresh(inst)
-    return InstitutionRead(id=inst.id, name=inst.name, code=inst.code, override_count=0)
+    invalidate()
+    return InstitutionRead.model_construct(
+        id=inst.id, name=inst.name, code=inst.code, override_count=0
+    )
 
 
 @router.delete("/{institution_id}", status_code=204)
@@ -103,10 +162,14 @@ async def delete_institution(
         raise HTTPException(status_code=404, detail="Institution not found")
     await db.delete(inst)
     await db.commit()
+    invalidate()
 
 
 # ─── Coverage Overrides ──────────────────────────────────────────
 
+# Columns of uq_coverage_override, the upsert conflict target
+_OVERRIDE_KEY = ["institution_id", "antibiotic_id", "pathogen_id"]
+
 
 @router.post("/{institution_id}/overrides", status_code=201)
 async def create_override(
@@ -114,19 +177,62 @@ async def create_override(
     data: CoverageOverrideCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    inst = await db.get(Institution, institution_id)
-    if not inst:
+    # INSERT ... SELECT FROM institutions: the parent check and the insert are
+    # one statement, and RETURNING tells us whether a row went in. Re-posting
+    # an existing (antibiotic, pathogen) pair updates it in place.
+    stmt = upsert(db, CoverageOverride).from_select(
+        ["institution_id", "antibiotic_id", "pathogen_id", "is_covered"],
+        select(
+            Institution.id,
+            literal(data.antibiotic_id),
+            literal(data.pathogen_id),
+            literal(data.is_covered),
+        ).where(Institution.id == institution_id),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=_OVERRIDE_KEY, set_={"is_covered": stmt.excluded.is_covered}
+    ).returning(CoverageOverride.id)
+    override_id = (await db.execute(stmt)).scalar_one_or_none()
+    if override_id is None:
         raise HTTPException(status_code=404, detail="Institution not found")
 
-    override = CoverageOverride(
-        institution_id=institution_id,
-        antibiotic_id=data.antibiotic_id,
-        pathogen_id=data.pathogen_id,
-        is_covered=data.is_covered,
-    )
-    db.add(override)
     await db.commit()
-    return {"status": "created"}
+    invalidate()
+    return {"status": "created", "id": override_id}
+
+
+@router.post("/{institution_id}/overrides/bulk", status_code=201)
+async def create_overrides_bulk(
+    institution_id: int,
+    data: list[CoverageOverrideCreate],
+    db: AsyncSession = Depends(get_db),
+):
+    exists = await db.scalar(select(Institution.id).where(Institution.id == institution_id))
+    if exists is None:
+        raise HTTPException(status_code=404, detail="Institution not found")
+
+    # Last entry wins for repeated pairs: one upsert may not touch a row twice
+    rows = {
+        (o.antibiotic_id, o.pathogen_id): {
+            "institution_id": institution_id,
+            "antibiotic_id": o.antibiotic_id,
+            "pathogen_id": o.pathogen_id,
+            "is_covered": o.is_covered,
+        }
+        for o in data
+    }
+
+    # One executemany for the whole batch, one commit
+    if rows:
+        stmt = upsert(db, CoverageOverride)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=_OVERRIDE_KEY, set_={"is_covered": stmt.excluded.is_covered}
+        )
+        await db.execute(stmt, list(rows.values()))
+        await db.commit()
+        invalidate()
+    # Repeated pairs collapse to one row, so report what was written
+    return {"status": "created", "count": len(rows)}
 
 
 @router.delete("/{institution_id}/overrides/{override_id}", status_code=204)
@@ -135,8 +241,17 @@ async def delete_override(
     override_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    override = await db.get(CoverageOverride, override_id)
-    if not override or override.institution_id != institution_id:
+    # RETURNING doubles as the existence (and ownership) check
+    result = await db.execute(
+        delete(CoverageOverride)
+        .where(
+            CoverageOverride.id == override_id,
+            CoverageOverride.institution_id == institution_id,
+        )
+        .returning(CoverageOverride.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Override not found")
-    await db.delete(override)
+
     await db.commit()
+    invalidate()
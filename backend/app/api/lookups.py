@@ -1,29 +1,92 @@
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from app.core.database import get_db
+from app.core.cache import cached, etag_response, tagged
+from app.core.database import get_conn
 from app.models.antibiotic import CrclRange, Pathogen, PenetrationSite
 from app.schemas.common import CrclRangeRead, PathogenRead, PenetrationSiteRead
 
 router = APIRouter(prefix="/api", tags=["lookups"])
 
+# These handlers select plain columns and cache the encoded JSON with its
+# ETag, so a hit costs neither a query nor serialization; response_model only
+# documents the shape.
+
 
 @router.get("/pathogens", response_model=list[PathogenRead])
-async def list_pathogens(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Pathogen).order_by(Pathogen.sort_order))
-    return result.scalars().all()
+async def list_pathogens(request: Request, conn: AsyncConnection = Depends(get_conn)):
+    return etag_response(request, *await _pathogens_json(conn))
+
+
+@cached
+async def _pathogens_json(conn: AsyncConnection) -> tuple[str, bytes]:
+    result = await conn.execute(
+        select(
+            Pathogen.id,
+            Pathogen.code,
+            Pathogen.name,
+            Pathogen.pathogen_type,
+            Pathogen.sort_order,
+        ).order_by(Pathogen.sort_order)
+    )
+    return tagged(orjson.dumps([
+        {
+            "id": id_,
+            "code": code,
+            "name": name,
+            "pathogen_type": pathogen_type.value,
+            "sort_order": sort_order,
+        }
+        for id_, code, name, pathogen_type, sort_order in result
+    ]))
 
 
 @router.get("/penetration-sites", response_model=list[PenetrationSiteRead])
-async def list_penetration_sites(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(PenetrationSite).order_by(PenetrationSite.sort_order)
+async def list_penetration_sites(
+    request: Request, conn: AsyncConnection = Depends(get_conn)
+):
+    return etag_response(request, *await _penetration_sites_json(conn))
+
+
+@cached
+async def _penetration_sites_json(conn: AsyncConnection) -> tuple[str, bytes]:
+    result = await conn.execute(
+        select(
+            PenetrationSite.id,
+            PenetrationSite.code,
+            PenetrationSite.name,
+            PenetrationSite.sort_order,
+        ).order_by(PenetrationSite.sort_order)
     )
-    return result.scalars().all()
+    return tagged(orjson.dumps([dict(row) for row in result.mappings()]))
 
 
 @router.get("/crcl-ranges", response_model=list[CrclRangeRead])
-async def list_crcl_ranges(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(CrclRange).order_by(CrclRange.sort_order))
-    return result.scalars().all()
+async def list_crcl_ranges(request: Request, conn: AsyncConnection = Depends(get_conn)):
+    return etag_response(request, *await _crcl_ranges_json(conn))
+
+
+@cached
+async def _crcl_ranges_json(conn: AsyncConnection) -> tuple[str, bytes]:
+    result = await conn.execute(
+        select(
+            CrclRange.id,
+            CrclRange.label,
+            CrclRange.lower_bound,
+            CrclRange.upper_bound,
+            CrclRange.sort_order,
+        ).order_by(CrclRange.sort_order)
+    )
+    # Numeric columns arrive as Decimal, which orjson does not encode
+    return tagged(orjson.dumps([
+        {
+            "id": id_,
+            "label": label,
+            "lower_bound": float(lower) if lower is not None else None,
+            "upper_bound": float(upper) if upper is not None else None,
+            "sort_order": sort_order,
+        }
+        for id_, label, lower, upper, sort_order in result
+    ]))
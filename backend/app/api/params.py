@@ -0,0 +1,16 @@
+import enum
+from typing import TypeVar
+
+from fastapi import HTTPException
+
+E = TypeVar("E", bound=enum.Enum)
+
+
+def enum_member(by_value: dict[str, E], value: str | None, field: str) -> E:
+    """Resolve a request value to its enum member, or reject it with a 422."""
+    try:
+        return by_value[value]
+    except KeyError:
+        raise HTTPException(
+            status_code=422, detail=f"Invalid {field}: {value!r}"
+        ) from None
@@ -0,0 +1,87 @@
+"""In-process cache for the read-only API endpoints.
+
+Catalogue data only changes through the admin CRUD endpoints, which call
+invalidate() after committing. The TTL bounds how stale another replica's
+copy can get, since invalidation does not cross processes.
+"""
+
+import functools
+import hashlib
+import time
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+TTL_SECONDS = 300
+MAX_ENTRIES = 1024
+
+_entries: dict[tuple, tuple[float, object]] = {}
+_UNKEYED = (AsyncSession, AsyncConnection)
+
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def cached(func):
+    """Cache an async function's result keyed by its arguments.
+
+    Sessions and connections are left out of the key. Exceptions (404s,
+    400s) are not cached.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (
+            func.__qualname__,
+            *(_freeze(a) for a in args if not isinstance(a, _UNKEYED)),
+            *sorted(
+                (k, _freeze(v)) for k, v in kwargs.items()
+                if not isinstance(v, _UNKEYED)
+            ),
+        )
+        now = time.monotonic()
+        entry = _entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        result = await func(*args, **kwargs)
+        if len(_entries) >= MAX_ENTRIES:
+            # Drop the oldest entry; dicts keep insertion order
+            _entries.pop(next(iter(_entries)))
+        _entries[key] = (now + TTL_SECONDS, result)
+        return result
+
+    return wrapper
+
+
+def invalidate() -> None:
+    """Forget every cached response; call after committing a catalogue change."""
+    _entries.clear()
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+def tagged(payload: bytes) -> tuple[str, bytes]:
+    """Pair an encoded JSON body with a content-derived ETag.
+
+    Hashing the body (once, when the cache is filled) keeps the tag correct
+    across replicas and restarts, unlike a per-process version counter.
+    """
+    return f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"', payload
+
+
+def etag_response(request: Request, etag: str, payload: bytes) -> Response:
+    """200 with the JSON body and its ETag, or 304 if the client has it."""
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=payload, media_type="application/json", headers={"ETag": etag}
+    )
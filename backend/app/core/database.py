@@ -1,14 +1,77 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import ColumnElement, any_, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    query_cache_size=2000,
+    connect_args={
+        # asyncpg's own statement cache and SQLAlchemy's prepared-statement cache
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # Queries here are short OLTP lookups; JIT compilation only adds latency
+        "server_settings": {"jit": "off"},
+    },
+)
 
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
 
+async def warm_pool() -> None:
+    """Open pool_size connections up front so first requests skip the handshake."""
+
+    async def _connect() -> None:
+        async with engine.connect():
+            pass
+
+    await asyncio.gather(*(_connect() for _ in range(settings.DB_POOL_SIZE)))
+
+
 async def get_db() -> AsyncGenerator[AsyncSession]:
     async with async_session_factory() as session:
         yield session
+
+
+async def get_conn() -> AsyncGenerator[AsyncConnection]:
+    """Core-only connection for read endpoints that never touch the ORM."""
+    async with engine.connect() as conn:
+        yield conn
+
+
+def in_values(db: AsyncSession, column, values: Sequence) -> ColumnElement[bool]:
+    """``column IN values`` that compiles to the same SQL for any list length.
+
+    On PostgreSQL the list is bound as a single array (``= ANY($1)``), so the
+    statement text and its prepared-statement cache entry stay stable; other
+    dialects (SQLite in tests) fall back to an expanding IN.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
+    return column.in_(values)
+
+
+def upsert(db: AsyncSession, model):
+    """``insert(model)`` for the session's dialect, with ON CONFLICT support.
+
+    PostgreSQL and SQLite share the on_conflict_do_* API, so callers can
+    build one statement for production and tests.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,90 @@
+"""In-process snapshots of the small reference (lookup) tables.
+
+pathogens, penetration_sites and crcl_ranges only change through migrations
+and seeding, so they are loaded once per process and joined in Python
+instead of on every request.
+"""
+
+from bisect import bisect_right
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.antibiotic import CrclRange, Pathogen, PenetrationSite
+
+
+class CrclRanges:
+    """Snapshot of the crcl_ranges table with bisect-based range resolution."""
+
+    def __init__(self, rows) -> None:
+        self.by_label = {r.label: r for r in rows}
+        # Ranges with a lower bound, ascending (sort_order follows the bounds)
+        self.bounded = [r for r in rows if r.lower_bound is not None]
+        self.lowers = [float(r.lower_bound) for r in self.bounded]
+        self.uppers = [
+            float(r.upper_bound) if r.upper_bound is not None else None
+            for r in self.bounded
+        ]
+
+    def resolve(self, crcl: float | None):
+        """Find the CrCl range for a given value. Boundary rule: value takes the higher range."""
+        if crcl is None or crcl > 90:
+            # Normal renal function
+            return self.by_label["Normal"]
+
+        # Highest range whose lower bound is <= crcl, then walk down until the
+        # upper bound admits the value, e.g. CrCl=50 → "50~60" range
+        for i in range(bisect_right(self.lowers, crcl) - 1, -1, -1):
+            upper = self.uppers[i]
+            if upper is None or crcl <= upper:
+                return self.bounded[i]
+
+        # Fallback: <5 range
+        return self.by_label["<5"]
+
+
+class ReferenceData:
+    """Pathogens and penetration sites keyed by id, plus the CrCl table."""
+
+    def __init__(self, pathogens, sites, crcl_ranges) -> None:
+        self.pathogens = {p.id: p for p in pathogens}
+        self.pathogen_ids = {p.code: p.id for p in pathogens}
+        self.sites = {s.id: s for s in sites}
+        self.crcl_ranges = CrclRanges(crcl_ranges)
+
+
+_reference: ReferenceData | None = None
+
+
+async def load_reference_data(db: AsyncSession) -> ReferenceData:
+    pathogens = await db.execute(
+        select(Pathogen.id, Pathogen.code, Pathogen.name).order_by(Pathogen.sort_order)
+    )
+    sites = await db.execute(
+        select(PenetrationSite.id, PenetrationSite.code, PenetrationSite.name)
+        .order_by(PenetrationSite.sort_order)
+    )
+    crcl_ranges = await db.execute(
+        select(
+            CrclRange.id,
+            CrclRange.label,
+            CrclRange.lower_bound,
+            CrclRange.upper_bound,
+        ).order_by(CrclRange.sort_order)
+    )
+    return ReferenceData(pathogens.all(), sites.all(), crcl_ranges.all())
+
+
+async def get_reference_data(db: AsyncSession) -> ReferenceData:
+    """Return the process-wide snapshot, loading it on first use.
+
+    A snapshot taken before the lookup tables are seeded is not kept, so a
+    server started ahead of seed_data picks the data up once it exists.
+    """
+    global _reference
+    if _reference is not None:
+        return _reference
+    reference = await load_reference_data(db)
+    if reference.pathogens and reference.crcl_ranges.by_label:
+        _reference = reference
+    return reference
@@ -1,20 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.antibiotics import router as antibiotics_router
 from app.api.empiric import router as empiric_router
 from app.api.institutions import router as institutions_router
 from app.api.lookups import router as lookups_router
 from app.core.config import settings
+from app.core.database import async_session_factory, warm_pool
+from app.core.reference import get_reference_data
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the connection pool and reference-table snapshot before serving traffic
+    await warm_pool()
+    async with async_session_factory() as session:
+        await get_reference_data(session)
+    yield
 
-app = FastAPI(title=settings.APP_TITLE)
+
+app = FastAPI(
+    title=settings.APP_TITLE,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=[settings.FRONTEND_ORIGIN],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
 )
 
 app.include_router(antibiotics_router)
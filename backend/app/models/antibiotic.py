@@ -5,6 +5,7 @@ from sqlalchemy import (
     Boolean,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -31,6 +32,11 @@ def _enum_values(enum_cls):
     return [e.value for e in enum_cls]
 
 
+def _deferrable_fk(target: str) -> ForeignKey:
+    """Cascading FK that bulk loads may defer to COMMIT (see migration 003)."""
+    return ForeignKey(target, ondelete="CASCADE", deferrable=True, initially="IMMEDIATE")
+
+
 # ─── 1. antibiotics ───────────────────────────────────────────────
 
 
@@ -58,7 +64,9 @@ class Antibiotic(TimestampMixin, Base):
         back_populates="antibiotic", cascade="all, delete-orphan"
     )
     regimens: Mapped[list["DosageRegimen"]] = relationship(
-        back_populates="antibiotic", cascade="all, delete-orphan"
+        back_populates="antibiotic",
+        cascade="all, delete-orphan",
+        order_by="DosageRegimen.sort_order",
     )
     toxicities: Mapped[list["Toxicity"]] = relationship(
         back_populates="antibiotic", cascade="all, delete-orphan"
@@ -113,15 +121,12 @@ class AntibioticCoverage(Base):
     __tablename__ = "antibiotic_coverage"
     __table_args__ = (
         UniqueConstraint("antibiotic_id", "pathogen_id", name="uq_coverage"),
+        Index("ix_coverage_pathogen_covered", "pathogen_id", "is_covered", "antibiotic_id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    antibiotic_id: Mapped[int] = mapped_column(
-        ForeignKey("antibiotics.id", ondelete="CASCADE")
-    )
-    pathogen_id: Mapped[int] = mapped_column(
-        ForeignKey("pathogens.id", ondelete="CASCADE")
-    )
+    antibiotic_id: Mapped[int] = mapped_column(_deferrable_fk("antibiotics.id"))
+    pathogen_id: Mapped[int] = mapped_column(_deferrable_fk("pathogens.id"))
     is_covered: Mapped[bool] = mapped_column(Boolean, default=False)
 
     antibiotic: Mapped["Antibiotic"] = relationship(back_populates="coverages")
@@ -138,12 +143,8 @@ class AntibioticPenetration(Base):
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    antibiotic_id: Mapped[int] = mapped_column(
-        ForeignKey("antibiotics.id", ondelete="CASCADE")
-    )
-    site_id: Mapped[int] = mapped_column(
-        ForeignKey("penetration_sites.id", ondelete="CASCADE")
-    )
+    antibiotic_id: Mapped[int] = mapped_column(_deferrable_fk("antibiotics.id"))
+    site_id: Mapped[int] = mapped_column(_deferrable_fk("penetration_sites.id"))
 
     antibiotic: Mapped["Antibiotic"] = relationship(back_populates="penetrations")
     site: Mapped["PenetrationSite"] = relationship(back_populates="penetrations")
@@ -171,11 +172,12 @@ class CrclRange(Base):
 
 class DosageRegimen(Base):
     __tablename__ = "dosage_regimens"
+    __table_args__ = (
+        Index("ix_regimens_ab_sort", "antibiotic_id", "sort_order"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    antibiotic_id: Mapped[int] = mapped_column(
-        ForeignKey("antibiotics.id", ondelete="CASCADE")
-    )
+    antibiotic_id: Mapped[int] = mapped_column(_deferrable_fk("antibiotics.id"))
     route: Mapped[Route] = mapped_column(Enum(Route, name="route", values_callable=_enum_values))
     indication: Mapped[Optional[str]] = mapped_column(String(255))
     dose_descriptor: Mapped[Optional[str]] = mapped_column(String(255))
@@ -192,7 +194,9 @@ class DosageRegimen(Base):
 
     antibiotic: Mapped["Antibiotic"] = relationship(back_populates="regimens")
     dosage_values: Mapped[list["DosageValue"]] = relationship(
-        back_populates="regimen", cascade="all, delete-orphan"
+        back_populates="regimen",
+        cascade="all, delete-orphan",
+        order_by="DosageValue.crcl_range_id",
     )
     dialysis_dosages: Mapped[list["DialysisDosage"]] = relationship(
         back_populates="regimen", cascade="all, delete-orphan"
@@ -209,15 +213,12 @@ class DosageValue(Base):
     __tablename__ = "dosage_values"
     __table_args__ = (
         UniqueConstraint("regimen_id", "crcl_range_id", name="uq_dosage_value"),
+        Index("ix_dosage_values_crcl", "crcl_range_id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    regimen_id: Mapped[int] = mapped_column(
-        ForeignKey("dosage_regimens.id", ondelete="CASCADE")
-    )
-    crcl_range_id: Mapped[int] = mapped_column(
-        ForeignKey("crcl_ranges.id", ondelete="CASCADE")
-    )
+    regimen_id: Mapped[int] = mapped_column(_deferrable_fk("dosage_regimens.id"))
+    crcl_range_id: Mapped[int] = mapped_column(_deferrable_fk("crcl_ranges.id"))
     dose_text: Mapped[str] = mapped_column(Text)
     dose_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
     dose_unit: Mapped[Optional[str]] = mapped_column(String(20))
@@ -238,9 +239,7 @@ class DosageStep(Base):
     __tablename__ = "dosage_steps"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    dosage_value_id: Mapped[int] = mapped_column(
-        ForeignKey("dosage_values.id", ondelete="CASCADE")
-    )
+    dosage_value_id: Mapped[int] = mapped_column(_deferrable_fk("dosage_values.id"))
     step_order: Mapped[int] = mapped_column(Integer)
     step_text: Mapped[str] = mapped_column(Text)
     dose_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
@@ -256,11 +255,12 @@ class DosageStep(Base):
 
 class DialysisDosage(Base):
     __tablename__ = "dialysis_dosages"
+    __table_args__ = (
+        Index("ix_dialysis_dosages_regimen", "regimen_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    regimen_id: Mapped[int] = mapped_column(
-        ForeignKey("dosage_regimens.id", ondelete="CASCADE")
-    )
+    regimen_id: Mapped[int] = mapped_column(_deferrable_fk("dosage_regimens.id"))
     dialysis_type: Mapped[DialysisType] = mapped_column(
         Enum(DialysisType, name="dialysis_type", values_callable=_enum_values)
     )
@@ -277,9 +277,7 @@ class Toxicity(Base):
     __tablename__ = "toxicities"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    antibiotic_id: Mapped[int] = mapped_column(
-        ForeignKey("antibiotics.id", ondelete="CASCADE")
-    )
+    antibiotic_id: Mapped[int] = mapped_column(_deferrable_fk("antibiotics.id"))
     category: Mapped[ToxicityCategory] = mapped_column(
         Enum(ToxicityCategory, name="toxicity_category", values_callable=_enum_values)
     )
@@ -307,14 +305,13 @@ class EmpiricSyndrome(Base):
 
 class EmpiricRecommendation(Base):
     __tablename__ = "empiric_recommendations"
+    __table_args__ = (
+        Index("ix_empiric_rec_syndrome", "syndrome_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    syndrome_id: Mapped[int] = mapped_column(
-        ForeignKey("empiric_syndromes.id", ondelete="CASCADE")
-    )
-    antibiotic_id: Mapped[int] = mapped_column(
-        ForeignKey("antibiotics.id", ondelete="CASCADE")
-    )
+    syndrome_id: Mapped[int] = mapped_column(_deferrable_fk("empiric_syndromes.id"))
+    antibiotic_id: Mapped[int] = mapped_column(_deferrable_fk("antibiotics.id"))
     tier: Mapped[EmpiricTier] = mapped_column(Enum(EmpiricTier, name="empiric_tier", values_callable=_enum_values))
     is_addon: Mapped[bool] = mapped_column(Boolean, default=False)
     addon_notes: Mapped[Optional[str]] = mapped_column(Text)
@@ -337,8 +334,11 @@ class Institution(Base):
     name: Mapped[str] = mapped_column(String(255))
     code: Mapped[str] = mapped_column(String(50), unique=True)
 
+    # ON DELETE CASCADE removes overrides; don't load them just to delete them
     coverage_overrides: Mapped[list["CoverageOverride"]] = relationship(
-        back_populates="institution", cascade="all, delete-orphan"
+        back_populates="institution",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -347,6 +347,12 @@ class Institution(Base):
 
 class CoverageOverride(Base):
     __tablename__ = "coverage_overrides"
+    __table_args__ = (
+        # Leads with institution_id, so it also serves per-institution lookups
+        UniqueConstraint(
+            "institution_id", "antibiotic_id", "pathogen_id", name="uq_coverage_override"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     institution_id: Mapped[int] = mapped_column(
@@ -398,11 +404,12 @@ class PathogenRelationship(Base):
 
 class AntibioticNote(Base):
     __tablename__ = "antibiotic_notes"
+    __table_args__ = (
+        Index("ix_antibiotic_notes_ab", "antibiotic_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    antibiotic_id: Mapped[int] = mapped_column(
-        ForeignKey("antibiotics.id", ondelete="CASCADE")
-    )
+    antibiotic_id: Mapped[int] = mapped_column(_deferrable_fk("antibiotics.id"))
     note_type: Mapped[str] = mapped_column(String(50))  # 'doctor', 'nurse', 'general'
     content: Mapped[str] = mapped_column(Text)
 
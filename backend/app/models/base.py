@@ -9,6 +9,10 @@ class Base(DeclarativeBase):
 
 
 class TimestampMixin:
+    # Fetch server-generated timestamps via RETURNING on INSERT/UPDATE, so
+    # committed objects stay readable without a refresh round trip.
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         server_default=func.now(), onupdate=func.now()
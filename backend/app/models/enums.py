@@ -67,3 +67,12 @@ class EmpiricTier(str, enum.Enum):
     primary = "primary"
     severe = "severe"
     alternative = "alternative"
+
+
+# ─── Value → member lookups ───────────────────────────────────────
+# Plain dict hits for request-path parsing instead of Enum.__call__.
+
+ANTIBIOTIC_CATEGORY_BY_VALUE = {m.value: m for m in AntibioticCategory}
+AGENT_TYPE_BY_VALUE = {m.value: m for m in AgentType}
+DIALYSIS_TYPE_BY_VALUE = {m.value: m for m in DialysisType}
+EMPIRIC_TIER_BY_VALUE = {m.value: m for m in EmpiricTier}
@@ -6,10 +6,12 @@ and outputs spreadsheet_data.json (structured drug objects).
 Run with: python -m scripts.convert_spreadsheet
 """
 
-import json
 import re
+from collections import defaultdict
 from pathlib import Path
 
+import orjson
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 RAW_PATH = SCRIPT_DIR / "spreadsheet_raw.json"
 OUT_PATH = SCRIPT_DIR / "spreadsheet_data.json"
@@ -32,27 +34,28 @@ COL_CRRT = 40
 COL_OTHER = 41
 COL_TOX_START = 43       # General
 COL_TOX_END = 53         # Endocrine (inclusive)
-
-# Coverage column index → pathogen code
-COVERAGE_MAP = {
-    3: "Strep",
-    4: "MSSA",
-    5: "Efc",
-    6: "Efm",
+N_COLS = COL_TOX_END + 1  # last column any pass reads
+
+# (coverage column index, pathogen code), in column order
+COVERAGE_COLS = (
+    (3, "Strep"),
+    (4, "MSSA"),
+    (5, "Efc"),
+    (6, "Efm"),
     # 7: GNB — no data in spreadsheet
     # 8: Enbac — no data in spreadsheet
-    9: "PsA",
+    (9, "PsA"),
     # 10: Ab — no data in spreadsheet
-    11: "Anae",
-    12: "Atyp",
-    13: "Steno",
-    14: "Glabrata",
-    15: "MRSA",
-    16: "ESBL",
-    17: "VRE",
-    18: "MDRAB",
-    19: "CRKP",
-}
+    (11, "Anae"),
+    (12, "Atyp"),
+    (13, "Steno"),
+    (14, "Glabrata"),
+    (15, "MRSA"),
+    (16, "ESBL"),
+    (17, "VRE"),
+    (18, "MDRAB"),
+    (19, "CRKP"),
+)
 
 # CrCl range labels in order (col 27-38)
 CRCL_LABELS = [
@@ -60,21 +63,36 @@ CRCL_LABELS = [
     "30~40", "40~50", "50~60", "60~80", "80~90", "Normal",
 ]
 
-# Toxicity column index → category key
-TOXICITY_MAP = {
-    43: "general",
-    44: "renal",
-    45: "hepatic",
-    46: "cardiac",
-    47: "neurologic",
-    48: "musculoskeletal",
-    49: "gi",
-    50: "skin",
-    51: "obgyn",
-    52: "hematologic",
-    53: "endocrine",
-}
+# (toxicity column index, category key), in column order
+TOXICITY_COLS = (
+    (43, "general"),
+    (44, "renal"),
+    (45, "hepatic"),
+    (46, "cardiac"),
+    (47, "neurologic"),
+    (48, "musculoskeletal"),
+    (49, "gi"),
+    (50, "skin"),
+    (51, "obgyn"),
+    (52, "hematologic"),
+    (53, "endocrine"),
+)
+
+# (penetration column index, site code)
+PENETRATION_COLS = ((COL_PEN_BBB, "BBB"), (COL_PEN_PROS, "Pros"), (COL_PEN_ENDO, "Endo"))
+
+# Route prefixes, most specific first → normalized route
+_ROUTE_PATTERNS = [
+    (re.compile(r"^IV/PO\b", re.IGNORECASE), "IV/PO"),
+    (re.compile(r"^PO/IV\b", re.IGNORECASE), "IV/PO"),
+    (re.compile(r"^IV/IM\b", re.IGNORECASE), "IV/IM"),
+    (re.compile(r"^INHL\b", re.IGNORECASE), "INHL"),
+    (re.compile(r"^IV\b", re.IGNORECASE), "IV"),
+    (re.compile(r"^PO\b", re.IGNORECASE), "PO"),
+    (re.compile(r"^IM\b", re.IGNORECASE), "IM"),
+]
 
+_GENERATION_RE = re.compile(r"\((\d)\s*°\s*\)")
 
 
 def _cell(row: list, idx: int) -> str | None:
@@ -82,19 +100,22 @@ def _cell(row: list, idx: int) -> str | None:
     if idx >= len(row):
         return None
     v = row[idx]
+    # Fast path: nearly every populated cell is already a string
+    if type(v) is str:
+        v = v.strip()
+        return v if v and v != "FALSE" else None
     if v is None:
         return None
     if isinstance(v, (int, float)):
-        return None  # numeric side-data, not relevant
+        return None  # numeric side-data (and booleans), not relevant
     v = str(v).strip()
     if v == "" or v == "FALSE":
         return None
     return v
 
 
-def _coverage_value(row: list, col: int) -> str | None:
-    """Extract coverage value (v, +, ++)."""
-    v = _cell(row, col)
+def _coverage_value(v: str | None) -> str | None:
+    """Normalize a coverage cell to v, + or ++."""
     if v in ("v", "+", "++"):
         return v
     if v == "TRUE":
@@ -104,7 +125,9 @@ def _coverage_value(row: list, col: int) -> str | None:
 
 def detect_generation(name: str) -> str | None:
     """Extract generation from name like 'Cefepime (4°)'."""
-    m = re.search(r"\((\d)\s*°\s*\)", name)
+    if "°" not in name:
+        return None  # most names; skips the regex entirely
+    m = _GENERATION_RE.search(name)
     return f"{m.group(1)}°" if m else None
 
 
@@ -123,22 +146,12 @@ def parse_route(route_raw: str) -> tuple[str, str | None]:
     if s.startswith("Stenotrophomonas"):
         return ("IV_PO", "Stenotrophomonas m.")
 
-    # Extract route prefix and indication
-    route_patterns = [
-        (r"^IV/PO\b", "IV/PO"),
-        (r"^PO/IV\b", "IV/PO"),
-        (r"^IV/IM\b", "IV/IM"),
-        (r"^INHL\b", "INHL"),
-        (r"^IV\b", "IV"),
-        (r"^PO\b", "PO"),
-        (r"^IM\b", "IM"),
-    ]
-
     route = "IV"  # default
     indication = None
 
-    for pattern, route_val in route_patterns:
-        m = re.match(pattern, s, re.IGNORECASE)
+    # Extract route prefix and indication
+    for pattern, route_val in _ROUTE_PATTERNS:
+        m = pattern.match(s)
         if m:
             route = route_val
             rest = s[m.end():].strip()
@@ -157,26 +170,20 @@ def parse_route(route_raw: str) -> tuple[str, str | None]:
     return (route, indication)
 
 
-def is_duplicate_row(new_row: list, existing_rows: list[list]) -> bool:
-    """Check if a row is a duplicate of an existing row (same route AND doses)."""
-    new_route = _cell(new_row, COL_ROUTE)
-    new_doses = [_cell(new_row, c) for c in range(COL_CRCL_START, COL_CRCL_END + 1)]
-
-    for ex_row in existing_rows:
-        ex_route = _cell(ex_row, COL_ROUTE)
-        ex_doses = [_cell(ex_row, c) for c in range(COL_CRCL_START, COL_CRCL_END + 1)]
-
-        if new_route == ex_route and new_doses == ex_doses:
-            return True
-    return False
+def _row_signature(cells: list) -> tuple:
+    """Dedup key for a normalized row: its route plus every CrCl dose."""
+    return (cells[COL_ROUTE], tuple(cells[COL_CRCL_START:COL_CRCL_END + 1]))
 
 
 def convert() -> dict:
     """Convert raw spreadsheet data to structured JSON."""
-    raw = json.loads(RAW_PATH.read_text(encoding="utf-8"))
+    raw = orjson.loads(RAW_PATH.read_bytes())
+
+    # Normalize every cell once; all passes below index this table
+    norm = [[_cell(row, c) for c in range(N_COLS)] for row in raw]
 
     # Row 0: credits, Row 1: headers, Rows 2+: data
-    data_rows = raw[2:]
+    data_rows = norm[2:]
 
     # First pass: build cascading category map (row_idx → category string)
     # Category values in Col 24 only appear on the first drug of each section
@@ -185,107 +192,107 @@ def convert() -> dict:
     current_cat = None
     for i, row in enumerate(data_rows):
         row_idx = i + 2
-        explicit_cat = _cell(row, COL_CATEGORY)
+        explicit_cat = row[COL_CATEGORY]
         if explicit_cat:
             current_cat = explicit_cat
         row_category[row_idx] = current_cat
 
     # Group by Reference Name (col 26)
-    groups: dict[str, list[int]] = {}  # ref_name → [row_indices into raw]
+    groups: defaultdict[str, list[int]] = defaultdict(list)  # ref_name → [row_indices into raw]
+    group_sigs: defaultdict[str, set[tuple]] = defaultdict(set)  # ref_name → accepted row signatures
     for i, row in enumerate(data_rows):
         row_idx = i + 2  # offset for raw index
-        ref = _cell(row, COL_REF_NAME)
+        ref = row[COL_REF_NAME]
         if ref is None:
             continue
-        if ref not in groups:
-            groups[ref] = []
         # Deduplicate: skip if identical route+doses already exist
-        existing_rows = [raw[ri] for ri in groups[ref]]
-        if not is_duplicate_row(row, existing_rows):
+        sig = _row_signature(row)
+        sigs = group_sigs[ref]
+        if sig not in sigs:
+            sigs.add(sig)
             groups[ref].append(row_idx)
         else:
-            print(f"  DEDUP: Skipping row {row_idx} ({ref}, route={_cell(row, COL_ROUTE)}) — duplicate")
+            print(f"  DEDUP: Skipping row {row_idx} ({ref}, route={row[COL_ROUTE]}) — duplicate")
 
     drugs = []
     for ref_name, row_indices in groups.items():
-        first_row = raw[row_indices[0]]
+        first_row = norm[row_indices[0]]
 
         # Drug name = Reference Name (col 26)
         name = ref_name
 
-        # Category: use explicit value from any row, or cascading value
-        # Store raw spreadsheet string — migrate_data.py will map to DB enums
-        category_raw = None
-        for ri in row_indices:
-            cat = _cell(raw[ri], COL_CATEGORY)
-            if cat:
-                category_raw = cat
-                break
-        if category_raw is None:
-            # Use cascading category from first row
-            category_raw = row_category.get(row_indices[0])
-
         generation = detect_generation(name)
 
-        # Coverage (from first row — all rows of same drug share coverage)
-        # Also check subsequent rows in case the first row's coverage is sparse
-        coverage = {}
-        for col, code in COVERAGE_MAP.items():
-            for ri in row_indices:
-                val = _coverage_value(raw[ri], col)
-                if val:
-                    coverage[code] = val
-                    break
-
         # Penetration (from first row)
         penetration = {}
-        for col, site in [(COL_PEN_BBB, "BBB"), (COL_PEN_PROS, "Pros"), (COL_PEN_ENDO, "Endo")]:
-            val = _cell(first_row, col)
+        for col, site in PENETRATION_COLS:
+            val = first_row[col]
             if val:
                 penetration[site] = True
 
-        # Regimens
+        # One pass over the group's rows fills every per-drug field; the
+        # first row with a value wins for category, coverage, notes and
+        # toxicities
+        category_raw = None
+        found_coverage: dict[str, str] = {}
         regimens = []
+        notes = None
+        toxicities = {}
         for ri in row_indices:
-            row = raw[ri]
-            route_raw = _cell(row, COL_ROUTE)
-            route, indication = parse_route(route_raw)
+            row = norm[ri]
 
-            # CrCl dosages
-            dosages = {}
-            for j, label in enumerate(CRCL_LABELS):
-                dose = _cell(row, COL_CRCL_START + j)
-                if dose:
-                    dosages[label] = dose
+            # Category: explicit value from any row (cascading fallback below)
+            # Store raw spreadsheet string — migrate_data.py will map to DB enums
+            if category_raw is None:
+                category_raw = row[COL_CATEGORY]
 
-            hd = _cell(row, COL_HD)
-            crrt = _cell(row, COL_CRRT)
+            # Coverage: all rows of a drug share it, but the first row's
+            # coverage may be sparse, so later rows fill the gaps
+            for col, code in COVERAGE_COLS:
+                if code not in found_coverage:
+                    val = _coverage_value(row[col])
+                    if val:
+                        found_coverage[code] = val
+
+            # Regimens
+            route, indication = parse_route(row[COL_ROUTE])
+
+            # CrCl dosages
+            dosages = {
+                label: dose
+                for label, dose in zip(CRCL_LABELS, row[COL_CRCL_START:COL_CRCL_END + 1])
+                if dose
+            }
 
             regimens.append({
                 "route": route,
                 "indication": indication,
                 "dosages": dosages if dosages else None,
-                "hd": hd,
-                "crrt": crrt,
+                "hd": row[COL_HD],
+                "crrt": row[COL_CRRT],
             })
 
-        # Notes (OTHER column — take first non-null across all rows)
-        notes = None
-        for ri in row_indices:
-            n = _cell(raw[ri], COL_OTHER)
-            if n:
-                notes = n
-                break
+            # Notes (OTHER column)
+            if notes is None:
+                notes = row[COL_OTHER]
 
-        # Toxicities (from first row that has any toxicity data)
-        toxicities = {}
-        for ri in row_indices:
-            for col, tox_key in TOXICITY_MAP.items():
-                val = _cell(raw[ri], col)
-                if val and tox_key not in toxicities:
-                    toxicities[tox_key] = val
-            if toxicities:
-                break
+            # Toxicities (from first row that has any toxicity data)
+            if not toxicities:
+                for col, tox_key in TOXICITY_COLS:
+                    val = row[col]
+                    if val:
+                        toxicities[tox_key] = val
+
+        if category_raw is None:
+            # Use cascading category from first row
+            category_raw = row_category.get(row_indices[0])
+
+        # Keep coverage in column order, whichever row each value came from
+        coverage = {
+            code: found_coverage[code]
+            for _, code in COVERAGE_COLS
+            if code in found_coverage
+        }
 
         drugs.append({
             "name": name,
@@ -298,21 +305,18 @@ def convert() -> dict:
             "toxicities": toxicities if toxicities else None,
         })
 
+    regimen_count = sum(len(d["regimens"]) for d in drugs)
     result = {
         "source": "Google Sheets 資料區 (gid=1738940485)",
         "generated_note": "Auto-generated by convert_spreadsheet.py. Do not edit manually.",
         "drug_count": len(drugs),
-        "regimen_count": sum(len(d["regimens"]) for d in drugs),
+        "regimen_count": regimen_count,
         "drugs": drugs,
     }
 
-    OUT_PATH.write_text(
-        json.dumps(result, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    print(f"Wrote {len(drugs)} drugs, "
-          f"{sum(len(d['regimens']) for d in drugs)} regimens "
-          f"to {OUT_PATH}")
+    # Same layout as json.dumps(indent=2, ensure_ascii=False), emitted as UTF-8
+    OUT_PATH.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    print(f"Wrote {len(drugs)} drugs, {regimen_count} regimens to {OUT_PATH}")
     return result
 
 
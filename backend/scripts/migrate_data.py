@@ -6,11 +6,15 @@ Phase 2: Import empiric rules from data.js
 Run with: python -m scripts.migrate_data
 """
 
+import csv
+import functools
+import io
 import json
 import re
+from collections.abc import Iterable
 from pathlib import Path
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, insert, select, text
 from sqlalchemy.orm import Session
 
 from app.models.antibiotic import (
@@ -107,25 +111,49 @@ _ANTIFUNGALS = {
 _ANTIVIRALS = {"Acyclovir", "Ganciclovir", "Peramivir", "Rapiacta"}
 
 
+_GENERATION_RE = re.compile(r"\((\d)\s*°\s*\)")
+
+
+def _first_match_re(patterns: list[str]) -> re.Pattern:
+    """One regex whose matched group index is the first pattern found in a name.
+
+    Each alternative is an anchored lookahead scanning the whole name, and
+    alternatives are tried in order, so rule priority is kept exactly (a
+    plain alternation would pick the leftmost match instead).
+    """
+    return re.compile(
+        "|".join(f"(?=.*?({re.escape(p.lower())}))" for p in patterns), re.DOTALL
+    )
+
+
+_CATEGORY_RE = _first_match_re([p for p, _ in _CATEGORY_RULES])
+_CATEGORY_BY_GROUP = [cat for _, cat in _CATEGORY_RULES]
+
+_AGENT_TYPE_KEYWORDS = [
+    *((k, AgentType.antifungal) for k in _ANTIFUNGALS),
+    *((k, AgentType.antiviral) for k in _ANTIVIRALS),
+]
+_AGENT_TYPE_RE = _first_match_re([k for k, _ in _AGENT_TYPE_KEYWORDS])
+_AGENT_TYPE_BY_GROUP = [agent_type for _, agent_type in _AGENT_TYPE_KEYWORDS]
+
+
+@functools.lru_cache(maxsize=256)
 def detect_category(name: str) -> AntibioticCategory:
-    for pattern, cat in _CATEGORY_RULES:
-        if pattern.lower() in name.lower():
-            return cat
-    return AntibioticCategory.other
+    m = _CATEGORY_RE.match(name.lower())
+    return _CATEGORY_BY_GROUP[m.lastindex - 1] if m else AntibioticCategory.other
 
 
+@functools.lru_cache(maxsize=256)
 def detect_agent_type(name: str) -> AgentType:
-    for keyword in _ANTIFUNGALS:
-        if keyword.lower() in name.lower():
-            return AgentType.antifungal
-    for keyword in _ANTIVIRALS:
-        if keyword.lower() in name.lower():
-            return AgentType.antiviral
-    return AgentType.antibacterial
+    m = _AGENT_TYPE_RE.match(name.lower())
+    return _AGENT_TYPE_BY_GROUP[m.lastindex - 1] if m else AgentType.antibacterial
 
 
+@functools.lru_cache(maxsize=256)
 def detect_generation(name: str) -> str | None:
-    m = re.search(r"\((\d)\s*°\s*\)", name)
+    if "°" not in name:
+        return None  # most names; skips the regex entirely
+    m = _GENERATION_RE.search(name)
     return f"{m.group(1)}°" if m else None
 
 
@@ -165,42 +193,90 @@ TOXICITY_KEY_MAP = {
 # ─── JS Parsing (for empiric rules) ─────────────────────────────
 
 
-def parse_data_js(path: Path) -> tuple[list[dict], list[dict]]:
-    """Parse data.js and extract ANTIBIOTICS and EMPIRIC_RULES arrays."""
+_JS_BRACKET_TOKEN_RE = re.compile(
+    r"""[\[\]]|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|//[^\n]*|/\*[\s\S]*?\*/"""
+)
+# One pass of JS → JSON rewrites; alternatives are tried left to right at
+# each position, so comments and string literals are consumed before their
+# contents could be mistaken for keys or commas
+_JS_TO_JSON_RE = re.compile(
+    r"(?P<comment>//[^\n]*)"
+    r'|(?P<dq>"(?:[^"\\\n]|\\.)*")'
+    r"|'(?P<sq>[^']*)'"
+    r"|,(?:\s|//[^\n]*)*(?P<close>[}\]])"
+    r"|(?<=[{,\n])\s*(?P<key>\w+)\s*:"
+)
+
+
+def parse_empiric_rules(path: Path) -> list[dict]:
+    """Parse only the EMPIRIC_RULES array from data.js.
+
+    The migration never imports ANTIBIOTICS (the spreadsheet is the source
+    of truth), so its much larger array is neither converted nor decoded.
+    """
     text = path.read_text(encoding="utf-8")
-    antibiotics = _extract_js_array(text, "ANTIBIOTICS")
-    empiric_rules = _extract_js_array(text, "EMPIRIC_RULES")
-    return antibiotics, empiric_rules
+    return _extract_js_arrays(text, ("EMPIRIC_RULES",))["EMPIRIC_RULES"]
 
 
-def _extract_js_array(text: str, var_name: str) -> list[dict]:
-    pattern = rf"const\s+{var_name}\s*=\s*\["
-    match = re.search(pattern, text)
-    if not match:
-        return []
-    start = match.start()
+_JS_ARRAY_DECL_RE = re.compile(r"const\s+(\w+)\s*=\s*\[")
+
+
+def _extract_js_arrays(text: str, var_names: tuple[str, ...]) -> dict[str, list[dict]]:
+    """Decode the named top-level ``const X = [...]`` arrays in one forward scan.
+
+    Each search resumes after the previous wanted array, so no byte is
+    searched twice. Names not declared map to [].
+    """
+    arrays: dict[str, list[dict]] = {name: [] for name in var_names}
+    wanted = set(var_names)
+    pos = 0
+    while wanted:
+        match = _JS_ARRAY_DECL_RE.search(text, pos)
+        if not match:
+            break
+        var_name = match.group(1)
+        if var_name not in wanted:
+            # Not bracket-matched: the regex skims past it far faster
+            pos = match.end()
+            continue
+        wanted.discard(var_name)
+        array_start = match.end() - 1
+        array_end = _js_array_end(text, array_start, var_name)
+        arrays[var_name] = json.loads(_js_to_json(text[array_start:array_end]))
+        pos = array_end
+    return arrays
+
+
+def _js_array_end(text: str, array_start: int, var_name: str) -> int:
+    # Jump between bracket-relevant tokens; string literals and comments are
+    # consumed whole so brackets inside them don't count
     bracket_depth = 0
-    array_start = text.index("[", start)
-    for i in range(array_start, len(text)):
-        if text[i] == "[":
+    for token in _JS_BRACKET_TOKEN_RE.finditer(text, array_start):
+        if token.group() == "[":
             bracket_depth += 1
-        elif text[i] == "]":
+        elif token.group() == "]":
             bracket_depth -= 1
             if bracket_depth == 0:
-                array_end = i + 1
-                break
-    js_array = text[array_start:array_end]
-    json_str = _js_to_json(js_array)
-    return json.loads(json_str)
+                return token.end()
+    raise ValueError(f"Unterminated {var_name} array")
 
 
 def _js_to_json(js: str) -> str:
-    s = js
-    s = re.sub(r"//[^\n]*", "", s)
-    s = re.sub(r"(?<=[{,\n])\s*(\w+)\s*:", r' "\1":', s)
-    s = re.sub(r"'([^']*)'", r'"\1"', s)
-    s = re.sub(r",\s*([}\]])", r"\1", s)
-    return s
+    return _JS_TO_JSON_RE.sub(_js_token_to_json, js)
+
+
+def _js_token_to_json(m: re.Match) -> str:
+    kind = m.lastgroup
+    if kind == "comment":
+        return ""
+    if kind == "sq":
+        return f'"{m.group("sq")}"'
+    if kind == "close":
+        # Trailing comma (and any comments after it) dropped
+        return m.group("close")
+    if kind == "key":
+        return f' "{m.group("key")}":'
+    return m.group()  # double-quoted string, already JSON
 
 
 # ─── Main Migration ───────────────────────────────────────────────
@@ -210,24 +286,37 @@ def migrate(session: Session) -> dict:
     """Run the full migration. Returns stats dict."""
     stats = {}
 
-    # Load lookup tables
-    pathogens = {p.code: p for p in session.execute(select(Pathogen)).scalars().all()}
-    sites = {s.code: s for s in session.execute(select(PenetrationSite)).scalars().all()}
-    crcl_ranges = {
-        r.label: r for r in session.execute(select(CrclRange)).scalars().all()
-    }
+    # Load lookup tables as code → id; the child rows only need the ids
+    pathogens = dict(session.execute(select(Pathogen.code, Pathogen.id)).all())
+    sites = dict(session.execute(select(PenetrationSite.code, PenetrationSite.id)).all())
+    crcl_ranges = dict(session.execute(select(CrclRange.label, CrclRange.id)).all())
 
     if not pathogens:
         raise RuntimeError("Pathogens table is empty. Run seed_data first.")
     if not crcl_ranges:
         raise RuntimeError("CrCl ranges table is empty. Run seed_data first.")
 
+    # Check child-table FKs once at COMMIT rather than per row (migration 003)
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+    elif dialect == "sqlite":
+        session.execute(text("PRAGMA defer_foreign_keys = ON"))
+
     # ─── Phase 0: Clear existing data ─────────────────────────────
     # Delete antibiotics (CASCADE removes coverage, penetration, regimens,
     # dosage_values, dialysis_dosages, notes, toxicities, empiric_recommendations)
-    session.execute(delete(EmpiricSyndrome))
-    session.execute(delete(Antibiotic))
-    session.flush()
+    if dialect == "postgresql":
+        # Every FK into these tables is ON DELETE CASCADE, so TRUNCATE ...
+        # CASCADE empties the same tables without deleting row by row, and
+        # restarts their id sequences
+        session.execute(text(
+            f"TRUNCATE {EmpiricSyndrome.__tablename__}, {Antibiotic.__tablename__} "
+            "RESTART IDENTITY CASCADE"
+        ))
+    else:
+        session.execute(delete(EmpiricSyndrome))
+        session.execute(delete(Antibiotic))
     print("Cleared existing antibiotics and empiric data")
 
     # ─── Phase 1: Import antibiotics from spreadsheet JSON ────────
@@ -235,8 +324,7 @@ def migrate(session: Session) -> dict:
     drugs = data["drugs"]
     print(f"Loaded {len(drugs)} drugs from spreadsheet_data.json")
 
-    antibiotic_map: dict[str, Antibiotic] = {}  # name → model
-
+    antibiotic_rows: list[dict] = []
     for drug in drugs:
         name = drug["name"]
         category_raw = drug.get("category_raw")
@@ -250,41 +338,68 @@ def migrate(session: Session) -> dict:
 
         generation = drug.get("generation") or detect_generation(name)
 
-        ab = Antibiotic(
-            name=name,
-            generic_name=None,
-            category=category.value,
-            agent_type=agent_type.value,
-            generation=generation,
-        )
-        session.add(ab)
-        session.flush()
-        antibiotic_map[name] = ab
+        antibiotic_rows.append({
+            "name": name,
+            "generic_name": None,
+            "category": category.value,
+            "agent_type": agent_type.value,
+            "generation": generation,
+        })
+
+    # RETURNING hands back every antibiotic's id for the child rows below
+    antibiotic_ids = _insert_rows(session, Antibiotic, antibiotic_rows)
+    antibiotic_map = {  # name → id
+        row["name"]: antibiotic_id
+        for row, antibiotic_id in zip(antibiotic_rows, antibiotic_ids)
+    }
 
+    # Child rows are collected as plain dicts and inserted one table at a time
+    coverage_rows: list[dict] = []
+    penetration_rows: list[dict] = []
+    regimen_rows: list[dict] = []
+    dosage_value_rows: list[dict] = []
+    dialysis_rows: list[dict] = []
+    note_rows: list[dict] = []
+    toxicity_rows: list[dict] = []
+    # Per regimen, the dosage/dialysis rows still waiting for its id
+    regimen_children: list[list[dict]] = []
+
+    # Unknown codes are reported once each, up front, naming the drugs that
+    # use them; the loop below just skips them
+    _warn_unknown("pathogen code", pathogens, (
+        (code, drug["name"]) for drug in drugs for code in drug.get("coverage") or {}
+    ))
+    _warn_unknown("CrCl range", crcl_ranges, (
+        (label, drug["name"])
+        for drug in drugs
+        for reg_data in drug.get("regimens", [])
+        for label in reg_data.get("dosages") or {}
+    ))
+    _warn_unknown("toxicity key", TOXICITY_KEY_MAP, (
+        (key, drug["name"]) for drug in drugs for key in drug.get("toxicities") or {}
+    ))
+
+    for antibiotic_id, drug in zip(antibiotic_ids, drugs):
         # ─── Coverage ─────────────────────────────────────────
         coverage_data = drug.get("coverage") or {}
         for code, value in coverage_data.items():
-            pathogen = pathogens.get(code)
-            if pathogen is None:
-                print(f"  WARNING: Unknown pathogen code '{code}' for {name}")
+            pathogen_id = pathogens.get(code)
+            if pathogen_id is None:
                 continue
             is_covered = bool(value and value.strip())
-            session.add(AntibioticCoverage(
-                antibiotic_id=ab.id,
-                pathogen_id=pathogen.id,
-                is_covered=is_covered,
-            ))
+            coverage_rows.append({
+                "antibiotic_id": antibiotic_id,
+                "pathogen_id": pathogen_id,
+                "is_covered": is_covered,
+            })
 
         # ─── Penetration ─────────────────────────────────────
         pen_data = drug.get("penetration") or {}
         for site_code in pen_data:
-            site = sites.get(site_code)
-            if site is None:
+            site_id = sites.get(site_code)
+            if site_id is None:
                 continue
-            session.add(AntibioticPenetration(
-                antibiotic_id=ab.id,
-                site_id=site.id,
-            ))
+            penetration_rows.append({"antibiotic_id": antibiotic_id, "site_id": site_id})
 
         # ─── Regimens ─────────────────────────────────────────
         for j, reg_data in enumerate(drug.get("regimens", [])):
@@ -292,122 +407,132 @@ def migrate(session: Session) -> dict:
             route = ROUTE_MAP.get(route_str, Route.IV)
             indication = reg_data.get("indication")
 
-            regimen = DosageRegimen(
-                antibiotic_id=ab.id,
-                route=route.value,
-                indication=indication,
-                is_preferred=(j == 0),
-                sort_order=j,
-            )
-            session.add(regimen)
-            session.flush()
+            regimen_rows.append({
+                "antibiotic_id": antibiotic_id,
+                "route": route.value,
+                "indication": indication,
+                "is_preferred": j == 0,
+                "sort_order": j,
+            })
+            children: list[dict] = []
+            regimen_children.append(children)
 
             # Dosage values for all CrCl ranges
             dosages = reg_data.get("dosages") or {}
             for label, dose_text in dosages.items():
-                crcl = crcl_ranges.get(label)
-                if crcl is None:
-                    print(f"  WARNING: Unknown CrCl range '{label}' for {name}")
+                crcl_range_id = crcl_ranges.get(label)
+                if crcl_range_id is None:
                     continue
-                if dose_text and dose_text.strip():
-                    session.add(DosageValue(
-                        regimen_id=regimen.id,
-                        crcl_range_id=crcl.id,
-                        dose_text=dose_text.strip(),
-                    ))
+                dose_text = (dose_text or "").strip()
+                if dose_text:
+                    row = {"crcl_range_id": crcl_range_id, "dose_text": dose_text}
+                    dosage_value_rows.append(row)
+                    children.append(row)
 
             # Dialysis dosages
-            hd_text = reg_data.get("hd")
-            crrt_text = reg_data.get("crrt")
-            if hd_text and hd_text.strip() and hd_text.strip().lower() != "no data":
-                session.add(DialysisDosage(
-                    regimen_id=regimen.id,
-                    dialysis_type=DialysisType.HD.value,
-                    dose_text=hd_text.strip(),
-                ))
-            if crrt_text and crrt_text.strip() and crrt_text.strip().lower() != "no data":
-                session.add(DialysisDosage(
-                    regimen_id=regimen.id,
-                    dialysis_type=DialysisType.CRRT.value,
-                    dose_text=crrt_text.strip(),
-                ))
+            for key, dialysis_type in (("hd", DialysisType.HD), ("crrt", DialysisType.CRRT)):
+                dose_text = (reg_data.get(key) or "").strip()
+                if dose_text and dose_text.lower() != "no data":
+                    row = {"dialysis_type": dialysis_type.value, "dose_text": dose_text}
+                    dialysis_rows.append(row)
+                    children.append(row)
 
         # ─── Notes ────────────────────────────────────────────
-        notes_text = drug.get("notes")
-        if notes_text and notes_text.strip():
-            session.add(AntibioticNote(
-                antibiotic_id=ab.id,
-                note_type="other",
-                content=notes_text.strip(),
-            ))
+        notes_text = (drug.get("notes") or "").strip()
+        if notes_text:
+            note_rows.append({
+                "antibiotic_id": antibiotic_id,
+                "note_type": "other",
+                "content": notes_text,
+            })
 
         # ─── Toxicities ──────────────────────────────────────
         tox_data = drug.get("toxicities") or {}
         for tox_key, description in tox_data.items():
             tox_cat = TOXICITY_KEY_MAP.get(tox_key)
             if tox_cat is None:
-                print(f"  WARNING: Unknown toxicity key '{tox_key}' for {name}")
                 continue
-            if description and description.strip():
-                session.add(Toxicity(
-                    antibiotic_id=ab.id,
-                    category=tox_cat.value,
-                    description=description.strip(),
-                ))
+            description = (description or "").strip()
+            if description:
+                toxicity_rows.append({
+                    "antibiotic_id": antibiotic_id,
+                    "category": tox_cat.value,
+                    "description": description,
+                })
+
+    _bulk_load_rows(session, AntibioticCoverage, coverage_rows)
+    _bulk_load_rows(session, AntibioticPenetration, penetration_rows)
+    regimen_ids = _insert_rows(session, DosageRegimen, regimen_rows)
+    for regimen_id, children in zip(regimen_ids, regimen_children):
+        for row in children:
+            row["regimen_id"] = regimen_id
+    _bulk_load_rows(session, DosageValue, dosage_value_rows)
+    _bulk_load_rows(session, DialysisDosage, dialysis_rows)
+    _bulk_load_rows(session, AntibioticNote, note_rows)
+    _bulk_load_rows(session, Toxicity, toxicity_rows)
 
     # Gather stats
     stats["antibiotics"] = len(antibiotic_map)
-    stats["coverage_records"] = session.execute(
-        select(AntibioticCoverage)
-    ).scalars().all().__len__()
-    stats["dosage_regimens"] = session.execute(
-        select(DosageRegimen)
-    ).scalars().all().__len__()
-    stats["dosage_values"] = session.execute(
-        select(DosageValue)
-    ).scalars().all().__len__()
-    stats["dialysis_dosages"] = session.execute(
-        select(DialysisDosage)
-    ).scalars().all().__len__()
-    stats["toxicities"] = session.execute(
-        select(Toxicity)
-    ).scalars().all().__len__()
+    stats["coverage_records"] = session.scalar(
+        select(func.count()).select_from(AntibioticCoverage)
+    )
+    stats["dosage_regimens"] = session.scalar(
+        select(func.count()).select_from(DosageRegimen)
+    )
+    stats["dosage_values"] = session.scalar(
+        select(func.count()).select_from(DosageValue)
+    )
+    stats["dialysis_dosages"] = session.scalar(
+        select(func.count()).select_from(DialysisDosage)
+    )
+    stats["toxicities"] = session.scalar(
+        select(func.count()).select_from(Toxicity)
+    )
 
     # ─── Phase 2: Import empiric rules from data.js ───────────────
-    _, empiric_data = parse_data_js(DATA_JS_PATH)
+    empiric_data = parse_empiric_rules(DATA_JS_PATH)
     print(f"Loaded {len(empiric_data)} empiric rules from data.js")
 
-    empiric_count = 0
-    for rule in empiric_data:
-        syndrome_name = rule.get("syndrome", "")
-        if not syndrome_name:
-            continue
-
-        syndrome = EmpiricSyndrome(name=syndrome_name)
-        session.add(syndrome)
-        session.flush()
+    rules = [rule for rule in empiric_data if rule.get("syndrome", "")]
+    syndrome_ids = _insert_rows(
+        session, EmpiricSyndrome, [{"name": rule["syndrome"]} for rule in rules]
+    )
 
+    lowered_names = [(name.lower(), ab_id) for name, ab_id in antibiotic_map.items()]
+    # The same drugs recur across syndromes and tiers; resolve each name once
+    resolved: dict[str, int | None] = {}
+    recommendation_rows: list[dict] = []
+    for syndrome_id, rule in zip(syndrome_ids, rules):
         for tier_name, tier_enum in [
             ("primary", EmpiricTier.primary),
             ("severe", EmpiricTier.severe),
             ("alternative", EmpiricTier.alternative),
         ]:
             for ab_name_raw in rule.get(tier_name, []):
-                ab_name_clean = ab_name_raw.split(" + ")[0].strip()
-                ab = _fuzzy_match_antibiotic(ab_name_clean, antibiotic_map)
-                if ab is None:
+                # "Drug + add-on": only the part before " + " names the drug
+                ab_name_clean, addon_sep, _ = ab_name_raw.partition(" + ")
+                ab_name_clean = ab_name_clean.strip()
+                if ab_name_clean in resolved:
+                    antibiotic_id = resolved[ab_name_clean]
+                else:
+                    antibiotic_id = resolved[ab_name_clean] = _fuzzy_match_antibiotic(
+                        ab_name_clean, antibiotic_map, lowered_names
+                    )
+                if antibiotic_id is None:
                     print(f"  WARNING: Empiric rule references unknown antibiotic '{ab_name_raw}'")
                     continue
 
-                is_addon = " + " in ab_name_raw
-                session.add(EmpiricRecommendation(
-                    syndrome_id=syndrome.id,
-                    antibiotic_id=ab.id,
-                    tier=tier_enum.value,
-                    is_addon=is_addon,
-                    addon_notes=ab_name_raw if is_addon else None,
-                ))
-                empiric_count += 1
+                is_addon = bool(addon_sep)
+                recommendation_rows.append({
+                    "syndrome_id": syndrome_id,
+                    "antibiotic_id": antibiotic_id,
+                    "tier": tier_enum.value,
+                    "is_addon": is_addon,
+                    "addon_notes": ab_name_raw if is_addon else None,
+                })
+
+    _bulk_load_rows(session, EmpiricRecommendation, recommendation_rows)
+    empiric_count = len(recommendation_rows)
 
     stats["empiric_syndromes"] = len(empiric_data)
     stats["empiric_recommendations"] = empiric_count
@@ -416,24 +541,104 @@ def migrate(session: Session) -> dict:
     return stats
 
 
-def _fuzzy_match_antibiotic(name: str, antibiotic_map: dict[str, Antibiotic]) -> Antibiotic | None:
-    """Match an antibiotic name from empiric rules to DB records."""
+def _warn_unknown(kind: str, known: dict, refs: Iterable[tuple[str, str]]) -> None:
+    """Print one warning per (code, drug name) ref whose code isn't in known."""
+    unknown: dict[str, list[str]] = {}
+    for code, drug_name in refs:
+        if code not in known:
+            unknown.setdefault(code, []).append(drug_name)
+    for code, drug_names in unknown.items():
+        print(f"  WARNING: Unknown {kind} '{code}' for {', '.join(drug_names)}")
+
+
+def _insert_rows(session: Session, model, rows: list[dict]) -> list[int]:
+    """Insert rows with one executemany-style INSERT; returns their new ids in order."""
+    if not rows:
+        return []
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list(session.scalars(stmt, rows))
+
+
+def _bulk_load_rows(session: Session, model, rows: list[dict]) -> None:
+    """Bulk-load rows whose ids aren't needed back.
+
+    On PostgreSQL (psycopg2) this streams them through COPY, which loads
+    large tables several times faster than INSERT; elsewhere it is a plain
+    Core INSERT on the table.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    bind = session.get_bind()
+    if (bind.dialect.name, bind.dialect.driver) == ("postgresql", "psycopg2"):
+        with session.connection().connection.cursor() as cursor:
+            _copy_rows(cursor, table, rows)
+    else:
+        # Core executemany on the Table: no ORM bulk-insert layer, no RETURNING
+        session.execute(table.insert(), rows)
+
+
+_COPY_NULL = r"\N"
+
+
+def _copy_rows(cursor, table, rows: list[dict]) -> None:
+    """COPY rows into table through a psycopg2 cursor.
+
+    COPY bypasses SQLAlchemy, so client-side scalar column defaults are
+    filled in here for columns the rows leave out.
+    """
+    defaults = {
+        c.name: c.default.arg
+        for c in table.columns
+        if c.default is not None and c.default.is_scalar
+    }
+    columns = [*rows[0], *(name for name in defaults if name not in rows[0])]
+
+    # csv writes None and "" alike as an empty field, so None is written as
+    # an explicit NULL marker and "" stays an empty string
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for row in rows:
+        writer.writerow([
+            _COPY_NULL if value is None else value
+            for value in (row.get(c, defaults.get(c)) for c in columns)
+        ])
+    buf.seek(0)
+
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+        f" WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+        buf,
+    )
+
+
+def _fuzzy_match_antibiotic(
+    name: str,
+    antibiotic_map: dict[str, int],
+    lowered: list[tuple[str, int]],
+) -> int | None:
+    """Match an antibiotic name from empiric rules to a DB id.
+
+    ``lowered`` is antibiotic_map's items with lowercased keys, in the same
+    order, built once by the caller.
+    """
     # Direct match
     if name in antibiotic_map:
         return antibiotic_map[name]
 
     # Fuzzy: check if query is contained in any DB name or vice versa
     name_lower = name.lower()
-    for key, ab in antibiotic_map.items():
-        if name_lower in key.lower() or key.lower() in name_lower:
-            return ab
+    for key, ab_id in lowered:
+        if name_lower in key or key in name_lower:
+            return ab_id
 
     # Try matching first word
-    first_word = name_lower.split()[0] if name_lower.split() else ""
+    words = name_lower.split()
+    first_word = words[0] if words else ""
     if first_word:
-        for key, ab in antibiotic_map.items():
-            if key.lower().startswith(first_word):
-                return ab
+        for key, ab_id in lowered:
+            if key.startswith(first_word):
+                return ab_id
 
     return None
 
@@ -448,7 +653,9 @@ def main() -> None:
     from app.core.config import settings
 
     engine = create_engine(settings.DATABASE_URL_SYNC)
-    SessionLocal = sessionmaker(bind=engine)
+    # migrate() writes through Core-style INSERTs, so there is nothing to
+    # autoflush, and nothing reads the models after the final commit
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
     with SessionLocal() as session:
         stats = migrate(session)
@@ -1,13 +1,15 @@
 """Seed reference/lookup data into the database.
 
 Populates: pathogens, penetration_sites, crcl_ranges.
+seed() takes an async session, seed_sync() a sync one.
 Run with: python -m scripts.seed_data
 """
 
 import asyncio
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.antibiotic import CrclRange, Pathogen, PenetrationSite
@@ -64,40 +66,55 @@ CRCL_RANGES = [
 ]
 
 
+# (model, rows, what the rows are, how to name the table when skipping)
+_SEED_TABLES = [
+    (Pathogen, PATHOGENS, "pathogens", "Pathogens table"),
+    (PenetrationSite, PENETRATION_SITES, "penetration sites", "Penetration sites table"),
+    (CrclRange, CRCL_RANGES, "CrCl ranges", "CrCl ranges table"),
+]
+
+
+def _has_rows(model):
+    return select(model.id).limit(1).exists()
+
+
+# One round trip tells which of the three tables are still empty
+_HAS_ROWS_STMT = select(*(_has_rows(model) for model, *_ in _SEED_TABLES))
+
+
+def _tables_to_seed(has_rows) -> list[tuple]:
+    """(model, rows, label) for each empty table; the caller inserts them."""
+    to_seed = []
+    for (model, rows, label, table), present in zip(_SEED_TABLES, has_rows):
+        if present:
+            print(f"  {table} already has data, skipping")
+        else:
+            to_seed.append((model, rows, label))
+    return to_seed
+
+
 async def seed(session: AsyncSession) -> None:
-    """Insert seed data if tables are empty."""
-
-    # Pathogens
-    result = await session.execute(select(Pathogen).limit(1))
-    if result.scalar_one_or_none() is None:
-        for p in PATHOGENS:
-            session.add(Pathogen(**p))
-        print(f"  Inserted {len(PATHOGENS)} pathogens")
-    else:
-        print("  Pathogens table already has data, skipping")
-
-    # Penetration Sites
-    result = await session.execute(select(PenetrationSite).limit(1))
-    if result.scalar_one_or_none() is None:
-        for s in PENETRATION_SITES:
-            session.add(PenetrationSite(**s))
-        print(f"  Inserted {len(PENETRATION_SITES)} penetration sites")
-    else:
-        print("  Penetration sites table already has data, skipping")
-
-    # CrCl Ranges
-    result = await session.execute(select(CrclRange).limit(1))
-    if result.scalar_one_or_none() is None:
-        for r in CRCL_RANGES:
-            session.add(CrclRange(**r))
-        print(f"  Inserted {len(CRCL_RANGES)} CrCl ranges")
-    else:
-        print("  CrCl ranges table already has data, skipping")
+    """Insert seed data if tables are empty (one batched INSERT per table)."""
+    has_rows = (await session.execute(_HAS_ROWS_STMT)).one()
+    for model, rows, label in _tables_to_seed(has_rows):
+        await session.execute(insert(model), rows)
+        print(f"  Inserted {len(rows)} {label}")
 
     await session.commit()
     print("Seed data complete.")
 
 
+def seed_sync(session: Session) -> None:
+    """seed() for a synchronous session."""
+    has_rows = session.execute(_HAS_ROWS_STMT).one()
+    for model, rows, label in _tables_to_seed(has_rows):
+        session.execute(insert(model), rows)
+        print(f"  Inserted {len(rows)} {label}")
+
+    session.commit()
+    print("Seed data complete.")
+
+
 async def main() -> None:
     engine = create_async_engine(settings.DATABASE_URL, echo=False)
     session_factory = async_sessionmaker(engine, expire_on_commit=False)
@@ -10,14 +10,11 @@ import sys
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
 
 from app.models.base import Base
 from scripts.migrate_data import migrate
-from scripts.seed_data import (
-    CRCL_RANGES,
-    PATHOGENS,
-    PENETRATION_SITES,
-)
+from scripts.seed_data import seed_sync
 from scripts.verify_migration import verify
 
 # Import all models so Base.metadata knows about them
@@ -30,21 +27,6 @@ def _setup_sqlite_enums(engine):
     pass
 
 
-def seed_sync(session):
-    """Synchronous version of seed for SQLite testing."""
-    from app.models.antibiotic import CrclRange, Pathogen, PenetrationSite
-    from app.models.enums import PathogenType
-
-    for p in PATHOGENS:
-        session.add(Pathogen(**p))
-    for s in PENETRATION_SITES:
-        session.add(PenetrationSite(**s))
-    for r in CRCL_RANGES:
-        session.add(CrclRange(**r))
-    session.commit()
-    print(f"  Seeded: {len(PATHOGENS)} pathogens, {len(PENETRATION_SITES)} sites, {len(CRCL_RANGES)} CrCl ranges")
-
-
 def main() -> None:
     print("=" * 60)
     print("End-to-End Migration Test (SQLite in-memory)")
@@ -53,29 +35,45 @@ def main() -> None:
     # Create SQLite in-memory engine
     engine = create_engine("sqlite:///:memory:", echo=False)
 
-    # Enable foreign key enforcement for SQLite
+    # Enable foreign key enforcement for SQLite; the database is throwaway,
+    # so skip syncing and keep the journal and temp tables in memory
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
         cursor.close()
 
-    # Create all tables from models
+    # Create all tables from models. Non-unique indexes are built after the
+    # load, once, instead of being maintained row by row during it.
     print("\n[1/4] Creating schema...")
-    Base.metadata.create_all(engine)
+    deferred_indexes = [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if not index.unique
+    ]
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            conn.execute(CreateTable(table))
+            for index in table.indexes:
+                if index.unique:
+                    index.create(conn)
     table_count = len(Base.metadata.tables)
     print(f"  Created {table_count} tables")
 
     SessionLocal = sessionmaker(bind=engine)
 
-    # Seed reference data
-    print("\n[2/4] Seeding reference data...")
+    # One session carries all three phases
     with SessionLocal() as session:
+        # Seed reference data
+        print("\n[2/4] Seeding reference data...")
         seed_sync(session)
 
-    # Run migration
-    print("\n[3/4] Running data migration from spreadsheet + empiric rules...")
-    with SessionLocal() as session:
+        # Run migration
+        print("\n[3/4] Running data migration from spreadsheet + empiric rules...")
         try:
             stats = migrate(session)
             print("\n  Migration stats:")
@@ -87,9 +85,13 @@ def main() -> None:
             traceback.print_exc()
             sys.exit(1)
 
-    # Verify
-    print("\n[4/4] Verifying data integrity...")
-    with SessionLocal() as session:
+        for index in deferred_indexes:
+            index.create(session.connection())
+        session.commit()
+        print(f"  Built {len(deferred_indexes)} deferred indexes")
+
+        # Verify
+        print("\n[4/4] Verifying data integrity...")
         passed, messages = verify(session)
         for msg in messages:
             print(msg)
@@ -6,10 +6,11 @@ nothing was lost or corrupted during migration.
 Run with: python -m scripts.verify_migration
 """
 
+import functools
 import json
 from pathlib import Path
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
 
 from app.models.antibiotic import (
@@ -27,23 +28,59 @@ from app.models.antibiotic import (
     PenetrationSite,
     Toxicity,
 )
-from scripts.migrate_data import parse_data_js
+from scripts.migrate_data import parse_empiric_rules
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 SPREADSHEET_JSON = SCRIPT_DIR / "spreadsheet_data.json"
 DATA_JS_PATH = SCRIPT_DIR.parent.parent / "data.js"
 
 
+# Normal-CrCl dose of an antibiotic's first regimen, in one statement; built
+# once at import so repeat runs only bind the antibiotic id
+_FIRST_REGIMEN_NORMAL_DOSE_STMT = (
+    select(DosageValue.dose_text)
+    .join(CrclRange, CrclRange.id == DosageValue.crcl_range_id)
+    .where(
+        CrclRange.label == "Normal",
+        DosageValue.regimen_id == (
+            select(DosageRegimen.id)
+            .where(DosageRegimen.antibiotic_id == bindparam("antibiotic_id"))
+            .order_by(DosageRegimen.sort_order)
+            .limit(1)
+            .scalar_subquery()
+        ),
+    )
+)
+
+
+def antibiotic_containing(antibiotics_by_name: dict, fragment: str):
+    """The one antibiotic whose name contains fragment, else None."""
+    found = [ab for name, ab in antibiotics_by_name.items() if fragment in name]
+    return found[0] if len(found) == 1 else None
+
+
+# The source files don't change within a process, so repeat verify() calls
+# reuse the first parse. Callers must treat the results as read-only.
+@functools.lru_cache(maxsize=1)
+def _cached_spreadsheet() -> dict:
+    return json.loads(SPREADSHEET_JSON.read_text(encoding="utf-8"))
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_empiric_rules() -> list[dict]:
+    return parse_empiric_rules(DATA_JS_PATH)
+
+
 def verify(session: Session) -> tuple[bool, list[str]]:
     """Run all verifications. Returns (all_passed, messages)."""
     messages: list[str] = []
     all_passed = True
 
     # Load source data for comparison
-    ss_data = json.loads(SPREADSHEET_JSON.read_text(encoding="utf-8"))
+    ss_data = _cached_spreadsheet()
     expected_drugs = ss_data["drug_count"]
     expected_regimens = ss_data["regimen_count"]
-    _, empiric_data = parse_data_js(DATA_JS_PATH)
+    empiric_data = _cached_empiric_rules()
 
     # --- Table counts ---
     checks = [
@@ -52,23 +89,8 @@ def verify(session: Session) -> tuple[bool, list[str]]:
         ("penetration_sites", PenetrationSite, 3),
         ("crcl_ranges", CrclRange, 12),
         ("empiric_syndromes", EmpiricSyndrome, len(empiric_data)),
+        ("dosage_regimens", DosageRegimen, expected_regimens),
     ]
-
-    messages.append("=== Table Record Counts ===")
-    for label, model, expected in checks:
-        count = session.scalar(select(func.count()).select_from(model))
-        status = "OK" if count == expected else "MISMATCH"
-        if status == "MISMATCH":
-            all_passed = False
-        messages.append(f"  {label}: {count} (expected {expected}) [{status}]")
-
-    # Check dosage regimens count
-    reg_count = session.scalar(select(func.count()).select_from(DosageRegimen))
-    reg_status = "OK" if reg_count == expected_regimens else "MISMATCH"
-    if reg_status == "MISMATCH":
-        all_passed = False
-    messages.append(f"  dosage_regimens: {reg_count} (expected {expected_regimens}) [{reg_status}]")
-
     # Other tables (report only)
     other_tables = [
         ("antibiotic_coverage", AntibioticCoverage),
@@ -79,33 +101,59 @@ def verify(session: Session) -> tuple[bool, list[str]]:
         ("toxicities", Toxicity),
         ("empiric_recommendations", EmpiricRecommendation),
     ]
+    # Every table's row count in one round trip, as scalar subqueries
+    counted = [model for _, model, _ in checks] + [model for _, model in other_tables]
+    counts = dict(zip(counted, session.execute(
+        select(*(select(func.count()).select_from(m).scalar_subquery() for m in counted))
+    ).one()))
+
+    messages.append("=== Table Record Counts ===")
+    for label, model, expected in checks:
+        count = counts[model]
+        status = "OK" if count == expected else "MISMATCH"
+        if status == "MISMATCH":
+            all_passed = False
+        messages.append(f"  {label}: {count} (expected {expected}) [{status}]")
+
     for label, model in other_tables:
-        count = session.scalar(select(func.count()).select_from(model))
-        messages.append(f"  {label}: {count}")
+        messages.append(f"  {label}: {counts[model]}")
 
     # --- Spot checks from plan verification requirements ---
     messages.append("\n=== Spot Checks ===")
 
+    # Lookups the spot checks resolve names and codes against, loaded once
+    # Only the columns the checks read (id, agent_type), not whole entities
+    antibiotics_by_name = {
+        ab.name: ab
+        for ab in session.execute(
+            select(Antibiotic.id, Antibiotic.name, Antibiotic.agent_type)
+        )
+    }
+    pathogen_ids = dict(session.execute(select(Pathogen.code, Pathogen.id)).all())
+    site_ids = dict(session.execute(select(PenetrationSite.code, PenetrationSite.id)).all())
+    # Covered (antibiotic_id, pathogen_id) pairs, regimens per antibiotic,
+    # and penetrated (antibiotic_id, site_id)
+    covered_pairs = set(session.execute(
+        select(AntibioticCoverage.antibiotic_id, AntibioticCoverage.pathogen_id)
+        .where(AntibioticCoverage.is_covered.is_(True))
+    ).tuples())
+    regimen_counts = dict(session.execute(
+        select(DosageRegimen.antibiotic_id, func.count()).group_by(DosageRegimen.antibiotic_id)
+    ).all())
+    penetrations = set(session.execute(
+        select(AntibioticPenetration.antibiotic_id, AntibioticPenetration.site_id)
+    ).tuples())
+
     def _check_coverage(drug_name, pathogen_code, expected_covered=True):
-        ab = session.execute(
-            select(Antibiotic).where(Antibiotic.name.contains(drug_name))
-        ).scalar_one_or_none()
+        ab = antibiotic_containing(antibiotics_by_name, drug_name)
         if not ab:
             messages.append(f"  {drug_name} not found: FAIL")
             return False
-        pathogen = session.execute(
-            select(Pathogen).where(Pathogen.code == pathogen_code)
-        ).scalar_one_or_none()
-        if not pathogen:
+        pathogen_id = pathogen_ids.get(pathogen_code)
+        if pathogen_id is None:
             messages.append(f"  Pathogen {pathogen_code} not found: FAIL")
             return False
-        cov = session.execute(
-            select(AntibioticCoverage).where(
-                AntibioticCoverage.antibiotic_id == ab.id,
-                AntibioticCoverage.pathogen_id == pathogen.id,
-            )
-        ).scalar_one_or_none()
-        covered = cov and cov.is_covered if cov else False
+        covered = (ab.id, pathogen_id) in covered_pairs
         ok = covered == expected_covered
         status = "OK" if ok else "FAIL"
         messages.append(f"  {drug_name} covers {pathogen_code}: {status}")
@@ -138,36 +186,20 @@ def verify(session: Session) -> tuple[bool, list[str]]:
     ok1 = _check_coverage("Metronidazole", "Anae")
     if not ok1:
         all_passed = False
-    metro = session.execute(
-        select(Antibiotic).where(Antibiotic.name == "Metronidazole")
-    ).scalar_one_or_none()
+    metro = antibiotics_by_name.get("Metronidazole")
     if metro:
-        bbb = session.execute(
-            select(PenetrationSite).where(PenetrationSite.code == "BBB")
-        ).scalar_one_or_none()
-        if bbb:
-            pen = session.execute(
-                select(AntibioticPenetration).where(
-                    AntibioticPenetration.antibiotic_id == metro.id,
-                    AntibioticPenetration.site_id == bbb.id,
-                )
-            ).scalar_one_or_none()
-            if pen:
+        bbb_id = site_ids.get("BBB")
+        if bbb_id is not None:
+            if (metro.id, bbb_id) in penetrations:
                 messages.append("  Metronidazole penetrates BBB: OK")
             else:
                 messages.append("  Metronidazole penetrates BBB: FAIL")
                 all_passed = False
 
     # 5. Teicoplanin should have 4 regimens
-    teico = session.execute(
-        select(Antibiotic).where(Antibiotic.name == "Teicoplanin")
-    ).scalar_one_or_none()
+    teico = antibiotics_by_name.get("Teicoplanin")
     if teico:
-        tcount = session.scalar(
-            select(func.count()).select_from(DosageRegimen).where(
-                DosageRegimen.antibiotic_id == teico.id
-            )
-        )
+        tcount = regimen_counts.get(teico.id, 0)
         if tcount == 4:
             messages.append(f"  Teicoplanin has {tcount} regimens: OK")
         else:
@@ -175,37 +207,18 @@ def verify(session: Session) -> tuple[bool, list[str]]:
             all_passed = False
 
     # 6. Tigecycline standard dose should be 50mg Q12h (not 25mg)
-    tige = session.execute(
-        select(Antibiotic).where(Antibiotic.name.contains("Tigecycline"))
-    ).scalar_one_or_none()
+    tige = antibiotic_containing(antibiotics_by_name, "Tigecycline")
     if tige:
-        normal_crcl = session.execute(
-            select(CrclRange).where(CrclRange.label == "Normal")
-        ).scalar_one_or_none()
-        first_reg = session.execute(
-            select(DosageRegimen).where(
-                DosageRegimen.antibiotic_id == tige.id
-            ).order_by(DosageRegimen.sort_order).limit(1)
-        ).scalar_one_or_none()
-        if first_reg and normal_crcl:
-            dv = session.execute(
-                select(DosageValue).where(
-                    DosageValue.regimen_id == first_reg.id,
-                    DosageValue.crcl_range_id == normal_crcl.id,
-                )
-            ).scalar_one_or_none()
-            if dv and "50mg" in dv.dose_text:
-                messages.append(f"  Tigecycline Normal dose contains 50mg: OK ({dv.dose_text})")
-            else:
-                dose = dv.dose_text if dv else "N/A"
-                messages.append(f"  Tigecycline Normal dose: FAIL (got: {dose})")
-                all_passed = False
+        dose = session.scalar(_FIRST_REGIMEN_NORMAL_DOSE_STMT, {"antibiotic_id": tige.id})
+        if dose and "50mg" in dose:
+            messages.append(f"  Tigecycline Normal dose contains 50mg: OK ({dose})")
+        else:
+            messages.append(f"  Tigecycline Normal dose: FAIL (got: {dose or 'N/A'})")
+            all_passed = False
 
     # 7. Acyclovir = antiviral, Fluconazole = antifungal
     for name, expected_type in [("Acyclovir", "antiviral"), ("Fluconazole", "antifungal")]:
-        ab = session.execute(
-            select(Antibiotic).where(Antibiotic.name == name)
-        ).scalar_one_or_none()
+        ab = antibiotics_by_name.get(name)
         if ab:
             if ab.agent_type.value == expected_type:
                 messages.append(f"  {name} agent_type={expected_type}: OK")
@@ -215,14 +228,7 @@ def verify(session: Session) -> tuple[bool, list[str]]:
 
     # 8. All spreadsheet drugs should exist in DB
     messages.append("\n=== Name Matching ===")
-    missing = []
-    for drug in ss_data["drugs"]:
-        name = drug["name"]
-        exists = session.execute(
-            select(Antibiotic).where(Antibiotic.name == name)
-        ).scalar_one_or_none()
-        if not exists:
-            missing.append(name)
+    missing = [d["name"] for d in ss_data["drugs"] if d["name"] not in antibiotics_by_name]
     if missing:
         messages.append(f"  Missing antibiotics: {missing}")
         all_passed = False
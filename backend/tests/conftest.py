@@ -1,26 +1,47 @@
 """Test fixtures: SQLite database with seed + migration data."""
 
+import sqlite3
+from contextlib import contextmanager
+from types import SimpleNamespace
+
 import pytest
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.models.base import Base
-import app.models.antibiotic  # noqa: F401 - register models
+from app.models.antibiotic import (
+    Antibiotic,
+    AntibioticPenetration,
+    Pathogen,
+    PenetrationSite,
+)
 
-from scripts.seed_data import PATHOGENS, PENETRATION_SITES, CRCL_RANGES
+from scripts.seed_data import seed_sync
 from scripts.migrate_data import migrate
+from scripts.verify_migration import antibiotic_containing
 
 
-@pytest.fixture(scope="session")
-def engine():
-    eng = create_engine("sqlite:///:memory:", echo=False)
-
+def _enable_foreign_keys(eng) -> None:
     @event.listens_for(eng, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
 
+
+@pytest.fixture(scope="session")
+def engine():
+    # One shared connection: every checkout, from any thread, sees the same
+    # in-memory database instead of a fresh empty one
+    eng = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        echo=False,
+    )
+    _enable_foreign_keys(eng)
     Base.metadata.create_all(eng)
     return eng
 
@@ -28,19 +49,11 @@ def engine():
 @pytest.fixture(scope="session")
 def seeded_session(engine):
     """Session with seed data + migrated data (once per test session)."""
-    from app.models.antibiotic import CrclRange, Pathogen, PenetrationSite
-
     SessionLocal = sessionmaker(bind=engine)
     session = SessionLocal()
 
-    # Seed
-    for p in PATHOGENS:
-        session.add(Pathogen(**p))
-    for s in PENETRATION_SITES:
-        session.add(PenetrationSite(**s))
-    for r in CRCL_RANGES:
-        session.add(CrclRange(**r))
-    session.commit()
+    # Seed (one batched INSERT per lookup table)
+    seed_sync(session)
 
     # Migrate
     migrate(session)
@@ -53,3 +66,113 @@ def seeded_session(engine):
 def db(seeded_session) -> Session:
     """Per-test database session (uses shared seeded data)."""
     return seeded_session
+
+
+@pytest.fixture()
+def api_engine(engine, seeded_session, tmp_path):
+    """Async engine over a private copy of the seeded database.
+
+    HTTP tests may write, so each gets its own file, copied from the shared
+    in-memory database with SQLite's backup API rather than re-migrated.
+    """
+    path = tmp_path / "api.db"
+    source = engine.raw_connection()
+    target = sqlite3.connect(path)
+    try:
+        source.driver_connection.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+    # NullPool: TestClient runs each request on its own event loop, so
+    # aiosqlite connections must not outlive one
+    eng = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    _enable_foreign_keys(eng.sync_engine)
+    return eng
+
+
+@pytest.fixture()
+def client(api_engine, monkeypatch):
+    """TestClient for the app, its database dependencies bound to api_engine."""
+    from fastapi.testclient import TestClient
+
+    from app.core import reference
+    from app.core.cache import invalidate
+    from app.core.database import get_conn, get_db
+    from app.main import app
+
+    session_factory = async_sessionmaker(api_engine, expire_on_commit=False)
+
+    async def override_db():
+        async with session_factory() as session:
+            yield session
+
+    async def override_conn():
+        async with api_engine.connect() as conn:
+            yield conn
+
+    # Start from a cold reference snapshot and response cache, and leave
+    # nothing behind for the next test
+    monkeypatch.setattr(reference, "_reference", None)
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_db)
+    monkeypatch.setitem(app.dependency_overrides, get_conn, override_conn)
+    invalidate()
+    yield TestClient(app)
+    invalidate()
+
+
+class Catalog:
+    """Antibiotics, lookup codes and penetrations, loaded once for lookups."""
+
+    def __init__(self, session: Session) -> None:
+        self.antibiotics = {
+            ab.name: ab
+            for ab in session.execute(
+                select(Antibiotic.id, Antibiotic.name, Antibiotic.agent_type)
+            )
+        }
+        self.pathogen_ids = dict(session.execute(select(Pathogen.code, Pathogen.id)).all())
+        self.site_ids = dict(
+            session.execute(select(PenetrationSite.code, PenetrationSite.id)).all()
+        )
+        self.penetrations = set(session.execute(
+            select(AntibioticPenetration.antibiotic_id, AntibioticPenetration.site_id)
+        ).tuples())
+
+    def antibiotic_containing(self, fragment: str):
+        """The one antibiotic whose name contains fragment."""
+        ab = antibiotic_containing(self.antibiotics, fragment)
+        assert ab is not None, f"no unique antibiotic containing {fragment!r}"
+        return ab
+
+
+@pytest.fixture(scope="session")
+def catalog(seeded_session) -> Catalog:
+    """Shared read-only lookups, so tests don't re-query single rows."""
+    return Catalog(seeded_session)
+
+
+@pytest.fixture()
+def count_queries(api_engine):
+    """Context manager counting the statements the app runs inside it.
+
+    Counts on api_engine, the database behind the client fixture, so tests
+    can pin a route's query budget and a lazy load sneaking in shows up as
+    a failure rather than going unnoticed on SQLite.
+    """
+    engine = api_engine.sync_engine
+
+    @contextmanager
+    def counting():
+        counter = SimpleNamespace(count=0)
+
+        def before_cursor_execute(*args):
+            counter.count += 1
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
@@ -1,7 +1,7 @@
 """API endpoint tests using sync SQLAlchemy session against SQLite.
 
-Tests query logic directly rather than through HTTP to avoid async complexity.
-The FastAPI routes use the same query logic, validated by import checks.
+Tests query logic and migrated data directly on the shared read-only
+session; the routes themselves are exercised over HTTP in test_endpoints.
 """
 
 from sqlalchemy import func, select
@@ -10,7 +10,6 @@ from app.models.antibiotic import (
     Antibiotic,
     AntibioticCoverage,
     AntibioticNote,
-    AntibioticPenetration,
     CrclRange,
     DialysisDosage,
     DosageRegimen,
@@ -45,22 +44,18 @@ class TestDataIntegrity:
 class TestCoverageSearch:
     """Test coverage-based search logic (replaces filterAntibiotics)."""
 
-    def test_search_esbl_coverage(self, db):
+    def test_search_esbl_coverage(self, db, catalog):
         """Find all antibiotics covering ESBL."""
-        esbl = db.execute(
-            select(Pathogen).where(Pathogen.code == "ESBL")
-        ).scalar_one()
-
         stmt = (
-            select(Antibiotic)
+            select(Antibiotic.name)
             .join(AntibioticCoverage)
             .where(
-                AntibioticCoverage.pathogen_id == esbl.id,
+                AntibioticCoverage.pathogen_id == catalog.pathogen_ids["ESBL"],
                 AntibioticCoverage.is_covered.is_(True),
             )
         )
-        results = db.execute(stmt).scalars().all()
-        names = {r.name for r in results}
+        results = db.scalars(stmt).all()
+        names = set(results)
 
         # Meropenem, Ertapenem, Tigecycline, Culin, Doripenem, Fosfomycin
         # should all cover ESBL
@@ -69,22 +64,18 @@ class TestCoverageSearch:
         assert "Tigecycline" in names
         assert len(results) >= 5
 
-    def test_search_mrsa_coverage(self, db):
+    def test_search_mrsa_coverage(self, db, catalog):
         """Find all antibiotics covering MRSA."""
-        mrsa = db.execute(
-            select(Pathogen).where(Pathogen.code == "MRSA")
-        ).scalar_one()
-
         stmt = (
-            select(Antibiotic)
+            select(Antibiotic.name)
             .join(AntibioticCoverage)
             .where(
-                AntibioticCoverage.pathogen_id == mrsa.id,
+                AntibioticCoverage.pathogen_id == catalog.pathogen_ids["MRSA"],
                 AntibioticCoverage.is_covered.is_(True),
             )
         )
-        results = db.execute(stmt).scalars().all()
-        names = {r.name for r in results}
+        results = db.scalars(stmt).all()
+        names = set(results)
 
         # Key MRSA drugs
         assert "Vancomycin" in names
@@ -92,50 +83,31 @@ class TestCoverageSearch:
         assert "Daptomycin" in names
         assert "Teicoplanin" in names
 
-    def test_search_multi_pathogen_coverage(self, db):
+    def test_search_multi_pathogen_coverage(self, db, catalog):
         """Find antibiotics covering BOTH Strep AND PsA (like Tazocin)."""
-        strep = db.execute(
-            select(Pathogen).where(Pathogen.code == "Strep")
-        ).scalar_one()
-        psa = db.execute(
-            select(Pathogen).where(Pathogen.code == "PsA")
-        ).scalar_one()
-
-        pathogen_ids = [strep.id, psa.id]
+        pathogen_ids = [catalog.pathogen_ids["Strep"], catalog.pathogen_ids["PsA"]]
 
         stmt = (
-            select(Antibiotic.id)
+            select(Antibiotic.name)
             .join(AntibioticCoverage)
             .where(
                 AntibioticCoverage.pathogen_id.in_(pathogen_ids),
                 AntibioticCoverage.is_covered.is_(True),
             )
-            .group_by(Antibiotic.id)
+            .group_by(Antibiotic.id, Antibiotic.name)
             .having(
                 func.count(func.distinct(AntibioticCoverage.pathogen_id))
                 == len(pathogen_ids)
             )
         )
-        matching_ids = [row[0] for row in db.execute(stmt).all()]
-
-        antibiotics = db.execute(
-            select(Antibiotic).where(Antibiotic.id.in_(matching_ids))
-        ).scalars().all()
-        names = {ab.name for ab in antibiotics}
+        names = set(db.scalars(stmt).all())
 
         assert any("Tazocin" in n for n in names)
         assert len(names) >= 1
 
-    def test_no_results_for_impossible_combo(self, db):
+    def test_no_results_for_impossible_combo(self, db, catalog):
         """No antibiotic covers both VRE and CRKP (except Tigecycline)."""
-        vre = db.execute(
-            select(Pathogen).where(Pathogen.code == "VRE")
-        ).scalar_one()
-        crkp = db.execute(
-            select(Pathogen).where(Pathogen.code == "CRKP")
-        ).scalar_one()
-
-        pathogen_ids = [vre.id, crkp.id]
+        pathogen_ids = [catalog.pathogen_ids["VRE"], catalog.pathogen_ids["CRKP"]]
         stmt = (
             select(Antibiotic.id)
             .join(AntibioticCoverage)
@@ -157,10 +129,8 @@ class TestCoverageSearch:
 class TestDosage:
     """Test dosage retrieval logic."""
 
-    def test_meropenem_has_dosages(self, db):
-        mero = db.execute(
-            select(Antibiotic).where(Antibiotic.name == "Meropenem")
-        ).scalar_one()
+    def test_meropenem_has_dosages(self, db, catalog):
+        mero = catalog.antibiotics["Meropenem"]
 
         regimens = db.execute(
             select(DosageRegimen).where(DosageRegimen.antibiotic_id == mero.id)
@@ -168,10 +138,8 @@ class TestDosage:
 
         assert len(regimens) == 2  # Standard IV, Prolonged infusion dose
 
-    def test_tazocin_dialysis_dosages(self, db):
-        tazocin = db.execute(
-            select(Antibiotic).where(Antibiotic.name.contains("Tazocin"))
-        ).scalar_one()
+    def test_tazocin_dialysis_dosages(self, db, catalog):
+        tazocin = catalog.antibiotic_containing("Tazocin")
 
         dial = db.execute(
             select(DialysisDosage)
@@ -190,6 +158,26 @@ class TestDosage:
         assert normal.lower_bound == 90
         assert normal.upper_bound is None
 
+    def test_crcl_range_resolution(self, db):
+        """Cached CrCl lookup: boundary values take the higher range."""
+        from app.core.reference import CrclRanges
+
+        rows = db.execute(
+            select(
+                CrclRange.id, CrclRange.label, CrclRange.lower_bound, CrclRange.upper_bound
+            ).order_by(CrclRange.sort_order)
+        ).all()
+        ranges = CrclRanges(rows)
+
+        assert ranges.resolve(None).label == "Normal"
+        assert ranges.resolve(120).label == "Normal"
+        assert ranges.resolve(90).label == "Normal"
+        assert ranges.resolve(85).label == "80~90"
+        assert ranges.resolve(50).label == "50~60"
+        assert ranges.resolve(49.5).label == "40~50"
+        assert ranges.resolve(5).label == "5~10"
+        assert ranges.resolve(3).label == "<5"
+
     def test_dosage_values_across_crcl_ranges(self, db):
         """Dosage values should span multiple CrCl ranges (not just Normal)."""
         total = db.scalar(select(func.count()).select_from(DosageValue))
@@ -204,58 +192,28 @@ class TestDosage:
 class TestPenetration:
     """Test penetration data."""
 
-    def test_ceftriaxone_bbb(self, db):
-        cef = db.execute(
-            select(Antibiotic).where(Antibiotic.name.contains("Ceftriaxone"))
-        ).scalar_one()
-        bbb = db.execute(
-            select(PenetrationSite).where(PenetrationSite.code == "BBB")
-        ).scalar_one()
+    def test_ceftriaxone_bbb(self, catalog):
+        cef = catalog.antibiotic_containing("Ceftriaxone")
+        assert (cef.id, catalog.site_ids["BBB"]) in catalog.penetrations
 
-        pen = db.execute(
-            select(AntibioticPenetration).where(
-                AntibioticPenetration.antibiotic_id == cef.id,
-                AntibioticPenetration.site_id == bbb.id,
-            )
-        ).scalar_one_or_none()
-        assert pen is not None
-
-    def test_meropenem_bbb(self, db):
-        mero = db.execute(
-            select(Antibiotic).where(Antibiotic.name == "Meropenem")
-        ).scalar_one()
-        bbb = db.execute(
-            select(PenetrationSite).where(PenetrationSite.code == "BBB")
-        ).scalar_one()
-
-        pen = db.execute(
-            select(AntibioticPenetration).where(
-                AntibioticPenetration.antibiotic_id == mero.id,
-                AntibioticPenetration.site_id == bbb.id,
-            )
-        ).scalar_one_or_none()
-        assert pen is not None
+    def test_meropenem_bbb(self, catalog):
+        mero = catalog.antibiotics["Meropenem"]
+        assert (mero.id, catalog.site_ids["BBB"]) in catalog.penetrations
 
 
 class TestAgentType:
     """Test agent_type classification."""
 
-    def test_acyclovir_is_antiviral(self, db):
-        ab = db.execute(
-            select(Antibiotic).where(Antibiotic.name == "Acyclovir")
-        ).scalar_one()
+    def test_acyclovir_is_antiviral(self, catalog):
+        ab = catalog.antibiotics["Acyclovir"]
         assert ab.agent_type.value == "antiviral"
 
-    def test_fluconazole_is_antifungal(self, db):
-        ab = db.execute(
-            select(Antibiotic).where(Antibiotic.name == "Fluconazole")
-        ).scalar_one()
+    def test_fluconazole_is_antifungal(self, catalog):
+        ab = catalog.antibiotics["Fluconazole"]
         assert ab.agent_type.value == "antifungal"
 
-    def test_meropenem_is_antibacterial(self, db):
-        ab = db.execute(
-            select(Antibiotic).where(Antibiotic.name == "Meropenem")
-        ).scalar_one()
+    def test_meropenem_is_antibacterial(self, catalog):
+        ab = catalog.antibiotics["Meropenem"]
         assert ab.agent_type.value == "antibacterial"
 
 
@@ -292,10 +250,8 @@ class TestEmpiric:
 class TestNotes:
     """Test antibiotic notes migration."""
 
-    def test_vancomycin_has_notes(self, db):
-        vanco = db.execute(
-            select(Antibiotic).where(Antibiotic.name == "Vancomycin")
-        ).scalar_one()
+    def test_vancomycin_has_notes(self, db, catalog):
+        vanco = catalog.antibiotics["Vancomycin"]
 
         notes = db.execute(
             select(AntibioticNote).where(AntibioticNote.antibiotic_id == vanco.id)
@@ -303,11 +259,9 @@ class TestNotes:
         assert len(notes) >= 1
         assert "peak" in notes[0].content.lower() or "trough" in notes[0].content.lower()
 
-    def test_empty_comments_not_stored(self, db):
+    def test_empty_comments_not_stored(self, db, catalog):
         """Antibiotics with empty comments should not have notes."""
-        cefuroxime = db.execute(
-            select(Antibiotic).where(Antibiotic.name.contains("Cefuroxime"))
-        ).scalar_one()
+        cefuroxime = catalog.antibiotic_containing("Cefuroxime")
 
         notes = db.execute(
             select(AntibioticNote).where(AntibioticNote.antibiotic_id == cefuroxime.id)
@@ -315,6 +269,47 @@ class TestNotes:
         assert len(notes) == 0
 
 
+class TestSchemas:
+    """Response schemas must be fully built at import, not on first request."""
+
+    def test_schemas_complete_at_import(self):
+        import app.schemas as schemas
+
+        for name in schemas.__all__:
+            assert getattr(schemas, name).__pydantic_complete__, name
+
+
+class TestInstitutionRows:
+    """Institution reads encode Core rows directly, so the row keys are the schema."""
+
+    def test_list_columns_match_schema(self, db, catalog):
+        from app.api.institutions import _LIST_STMT, _SUMMARY_STMT
+        from app.models.antibiotic import CoverageOverride, Institution
+        from app.schemas.institution import InstitutionRead
+
+        for stmt in (_LIST_STMT, _SUMMARY_STMT):
+            assert list(stmt.selected_columns.keys()) == list(InstitutionRead.model_fields)
+
+        # The shared session is read-only, so the institution is rolled back
+        ab_ids = [ab.id for ab in catalog.antibiotics.values()][:2]
+        pathogen_id = next(iter(catalog.pathogen_ids.values()))
+        try:
+            inst = Institution(name="Test Hospital", code="TEST")
+            inst.coverage_overrides = [
+                CoverageOverride(antibiotic_id=ab_id, pathogen_id=pathogen_id, is_covered=True)
+                for ab_id in ab_ids
+            ]
+            db.add(inst)
+            db.flush()
+
+            (row,) = db.execute(_LIST_STMT).mappings().all()
+            institution = InstitutionRead.model_validate(dict(row))
+            assert institution.code == "TEST"
+            assert institution.override_count == 2
+        finally:
+            db.rollback()
+
+
 class TestAppImport:
     """Verify the FastAPI app loads correctly."""
 
@@ -0,0 +1,64 @@
+"""Tests for the in-process response cache."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.core.cache import cached, invalidate
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    invalidate()
+    yield
+    invalidate()
+
+
+class TestResponseCache:
+    """Cached reads are keyed by arguments and dropped on invalidate()."""
+
+    def test_cached_until_invalidated(self):
+        calls = []
+
+        @cached
+        async def lookup(key):
+            calls.append(key)
+            return key
+
+        asyncio.run(lookup(1))
+        asyncio.run(lookup(1))
+        asyncio.run(lookup(2))
+        assert calls == [1, 2]
+
+        invalidate()
+        asyncio.run(lookup(1))
+        assert calls == [1, 2, 1]
+
+    def test_list_args_are_frozen_into_the_key(self):
+        calls = []
+
+        @cached
+        async def lookup(ids, *, order):
+            calls.append((ids, order))
+            return len(ids)
+
+        # Lists aren't hashable; equal lists must share one entry
+        asyncio.run(lookup([1, 2], order=["name"]))
+        asyncio.run(lookup([1, 2], order=["name"]))
+        asyncio.run(lookup([2, 1], order=["name"]))
+        assert calls == [([1, 2], ["name"]), ([2, 1], ["name"])]
+
+    def test_sessions_and_connections_are_left_out_of_the_key(self):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        calls = []
+
+        @cached
+        async def lookup(key, db, *, conn):
+            calls.append(key)
+            return key
+
+        # A fresh session per request must still hit the same entry
+        asyncio.run(lookup(1, AsyncSession(engine), conn=AsyncConnection(engine)))
+        asyncio.run(lookup(1, AsyncSession(engine), conn=AsyncConnection(engine)))
+        assert calls == [1]
@@ -0,0 +1,361 @@
+"""HTTP tests for the FastAPI routes, run through TestClient.
+
+Each test gets its own copy of the seeded SQLite database (see the client
+fixture), so writes made here never reach the shared session in test_api.
+"""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.core.cache import invalidate
+from app.models.antibiotic import (
+    Antibiotic,
+    AntibioticCoverage,
+    CrclRange,
+    DosageRegimen,
+    DosageValue,
+)
+
+
+class TestSearchByCoverage:
+    """GET /api/antibiotics/search/by-coverage."""
+
+    URL = "/api/antibiotics/search/by-coverage"
+
+    def test_multi_pathogen_requires_all(self, client, db, catalog):
+        """Only antibiotics covering every requested pathogen come back."""
+        response = client.get(self.URL, params={"pathogens": ["Strep", "PsA"]})
+        assert response.status_code == 200
+        results = response.json()
+
+        for result in results:
+            assert {"Strep", "PsA"} <= set(result["covered_pathogens"])
+
+        pathogen_ids = [catalog.pathogen_ids["Strep"], catalog.pathogen_ids["PsA"]]
+        expected = set(db.scalars(
+            select(Antibiotic.name)
+            .join(AntibioticCoverage)
+            .where(
+                AntibioticCoverage.pathogen_id.in_(pathogen_ids),
+                AntibioticCoverage.is_covered.is_(True),
+            )
+            .group_by(Antibiotic.id, Antibiotic.name)
+            .having(func.count() == len(pathogen_ids))
+        ).all())
+        assert {r["name"] for r in results} == expected
+        assert any("Tazocin" in r["name"] for r in results)
+
+    def test_single_pathogen_is_subset_of_pair(self, client):
+        """Adding a pathogen can only narrow the result."""
+        strep = client.get(self.URL, params={"pathogens": ["Strep"]}).json()
+        both = client.get(self.URL, params={"pathogens": ["Strep", "PsA"]}).json()
+
+        assert {r["id"] for r in both} < {r["id"] for r in strep}
+
+    def test_unknown_pathogen_rejected(self, client):
+        response = client.get(self.URL, params={"pathogens": ["Strep", "Nope"]})
+        assert response.status_code == 400
+        assert "Nope" in response.json()["detail"]
+
+    def test_query_budget(self, client, count_queries):
+        """One statement per search once the reference snapshot is loaded."""
+        with count_queries() as queries:
+            client.get(self.URL, params={"pathogens": ["ESBL"]})
+        # pathogens, penetration sites and CrCl ranges load the snapshot
+        assert queries.count == 3 + 1
+
+        for params in ({"pathogens": ["MRSA"]}, {"pathogens": ["Strep", "PsA"]}, {}):
+            with count_queries() as queries:
+                response = client.get(self.URL, params=params)
+            assert response.status_code == 200
+            assert queries.count == 1, params
+
+        # A repeat is served from the response cache
+        with count_queries() as queries:
+            client.get(self.URL, params={"pathogens": ["MRSA"]})
+        assert queries.count == 0
+
+
+class TestDosageForCrcl:
+    """GET /api/antibiotics/{id}/dosage."""
+
+    def test_unknown_antibiotic_is_404(self, client):
+        assert client.get("/api/antibiotics/999999/dosage").status_code == 404
+        assert client.get(
+            "/api/antibiotics/999999/dosage", params={"dialysis": "HD"}
+        ).status_code == 404
+
+    def test_boundary_value_takes_higher_range(self, client, db, catalog):
+        """CrCl=50 sits on the 40~50 / 50~60 boundary and resolves to 50~60."""
+        mero = catalog.antibiotics["Meropenem"]
+        response = client.get(f"/api/antibiotics/{mero.id}/dosage", params={"crcl": 50})
+        assert response.status_code == 200
+        body = response.json()
+
+        assert body["crcl_range_label"] == "50~60"
+        assert body["is_dialysis"] is False
+        expected = db.scalars(
+            select(DosageValue.dose_text)
+            .join(DosageRegimen)
+            .join(CrclRange)
+            .where(DosageRegimen.antibiotic_id == mero.id, CrclRange.label == "50~60")
+            .order_by(DosageRegimen.sort_order)
+        ).all()
+        assert expected
+        assert [
+            dv["dose_text"] for r in body["regimens"] for dv in r["dosage_values"]
+        ] == expected
+
+    def test_normal_boundary(self, client, catalog):
+        mero = catalog.antibiotics["Meropenem"]
+        url = f"/api/antibiotics/{mero.id}/dosage"
+        assert client.get(url, params={"crcl": 90}).json()["crcl_range_label"] == "Normal"
+        assert client.get(url, params={"crcl": 89.5}).json()["crcl_range_label"] == "80~90"
+        assert client.get(url).json()["crcl_range_label"] == "Normal"
+
+
+class TestReferenceSnapshot:
+    """Rows added after the reference snapshot loaded must not break reads."""
+
+    def test_pathogen_added_after_snapshot(self, client, api_engine, catalog):
+        mero = catalog.antibiotics["Meropenem"]
+        assert client.get(f"/api/antibiotics/{mero.id}").status_code == 200
+
+        conn = sqlite3.connect(api_engine.url.database)
+        with conn:
+            pathogen_id = conn.execute(
+                "INSERT INTO pathogens (code, name, pathogen_type, sort_order)"
+                " VALUES ('New', 'New pathogen', 'spectrum', 99)"
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO antibiotic_coverage (antibiotic_id, pathogen_id, is_covered)"
+                " VALUES (?, ?, 1)",
+                (mero.id, pathogen_id),
+            )
+        conn.close()
+        invalidate()
+
+        detail = client.get(f"/api/antibiotics/{mero.id}")
+        assert detail.status_code == 200
+        assert {
+            "pathogen_code": "Unknown", "pathogen_name": "Unknown", "is_covered": True
+        } in detail.json()["coverages"]
+
+        search = client.get("/api/antibiotics/search/by-coverage")
+        assert search.status_code == 200
+        (result,) = [r for r in search.json() if r["id"] == mero.id]
+        assert "Unknown" in result["covered_pathogens"]
+
+
+class TestAntibioticDetailETag:
+    """GET /api/antibiotics/{id} revalidation across an update."""
+
+    def test_etag_changes_after_update(self, client, catalog):
+        url = f"/api/antibiotics/{catalog.antibiotics['Meropenem'].id}"
+
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+        updated = client.put(url, json={"notes_for_doctor": "Check levels"})
+        assert updated.status_code == 200
+
+        fresh = client.get(url, headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != etag
+        assert fresh.json()["notes_for_doctor"] == "Check levels"
+
+    def test_unknown_antibiotic_is_404(self, client):
+        assert client.get("/api/antibiotics/999999").status_code == 404
+
+
+class TestCachedReads:
+    """Cached institution and lookup reads: 304s, and fresh data after writes."""
+
+    def test_institution_list_revalidates_and_refreshes(self, client):
+        first = client.get("/api/institutions")
+        assert first.status_code == 200
+        assert first.json() == []
+        etag = first.headers["etag"]
+
+        assert client.get(
+            "/api/institutions", headers={"If-None-Match": etag}
+        ).status_code == 304
+
+        created = client.post("/api/institutions", json={"name": "General", "code": "GEN"})
+        assert created.status_code == 201
+
+        fresh = client.get("/api/institutions", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != etag
+        assert [i["code"] for i in fresh.json()] == ["GEN"]
+
+    def test_institution_detail_refreshes_after_override_write(self, client, catalog):
+        inst_id = client.post(
+            "/api/institutions", json={"name": "General", "code": "GEN"}
+        ).json()["id"]
+        url = f"/api/institutions/{inst_id}"
+
+        first = client.get(url)
+        assert first.json()["overrides"] == []
+        etag = first.headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        client.post(f"{url}/overrides", json={
+            "antibiotic_id": catalog.antibiotics["Meropenem"].id,
+            "pathogen_id": catalog.pathogen_ids["MRSA"],
+            "is_covered": True,
+        })
+
+        fresh = client.get(url, headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != etag
+        assert fresh.json()["override_count"] == 1
+
+    def test_lookups_answer_304_for_current_etag(self, client):
+        for url in ("/api/pathogens", "/api/penetration-sites", "/api/crcl-ranges"):
+            first = client.get(url)
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+
+            cached = client.get(url, headers={"If-None-Match": etag})
+            assert cached.status_code == 304, url
+
+            # The tag hashes the body, so refilling the cache keeps it stable
+            invalidate()
+            assert client.get(url).headers["etag"] == etag, url
+
+
+class TestCoverageOverrides:
+    """Override writes for an institution."""
+
+    def _institution(self, client) -> str:
+        inst_id = client.post(
+            "/api/institutions", json={"name": "General", "code": "GEN"}
+        ).json()["id"]
+        return f"/api/institutions/{inst_id}"
+
+    def test_bulk_counts_deduplicated_rows(self, client, catalog):
+        url = self._institution(client)
+        mero = catalog.antibiotics["Meropenem"].id
+        vanco = catalog.antibiotics["Vancomycin"].id
+        mrsa = catalog.pathogen_ids["MRSA"]
+
+        response = client.post(f"{url}/overrides/bulk", json=[
+            {"antibiotic_id": mero, "pathogen_id": mrsa, "is_covered": True},
+            {"antibiotic_id": vanco, "pathogen_id": mrsa, "is_covered": False},
+            {"antibiotic_id": mero, "pathogen_id": mrsa, "is_covered": False},
+        ])
+        assert response.status_code == 201
+        assert response.json() == {"status": "created", "count": 2}
+
+        overrides = client.get(url).json()["overrides"]
+        # The last entry for a repeated pair wins
+        assert {(o["antibiotic_id"], o["is_covered"]) for o in overrides} == {
+            (mero, False), (vanco, False)
+        }
+
+    def test_bulk_unknown_institution_is_404(self, client):
+        response = client.post("/api/institutions/999999/overrides/bulk", json=[])
+        assert response.status_code == 404
+
+    def test_reposting_a_pair_updates_in_place(self, client, catalog):
+        url = self._institution(client)
+        override = {
+            "antibiotic_id": catalog.antibiotics["Meropenem"].id,
+            "pathogen_id": catalog.pathogen_ids["MRSA"],
+        }
+
+        first = client.post(f"{url}/overrides", json={**override, "is_covered": True})
+        second = client.post(f"{url}/overrides", json={**override, "is_covered": False})
+        assert first.status_code == second.status_code == 201
+        assert first.json()["id"] == second.json()["id"]
+
+        (stored,) = client.get(url).json()["overrides"]
+        assert stored["id"] == first.json()["id"]
+        assert stored["is_covered"] is False
+
+    def test_bulk_updates_existing_pair_in_place(self, client, catalog):
+        url = self._institution(client)
+        override = {
+            "antibiotic_id": catalog.antibiotics["Meropenem"].id,
+            "pathogen_id": catalog.pathogen_ids["MRSA"],
+        }
+        override_id = client.post(
+            f"{url}/overrides", json={**override, "is_covered": True}
+        ).json()["id"]
+
+        client.post(f"{url}/overrides/bulk", json=[{**override, "is_covered": False}])
+
+        (stored,) = client.get(url).json()["overrides"]
+        assert stored["id"] == override_id
+        assert stored["is_covered"] is False
+
+
+class TestOverrideDedupeMigration:
+    """Migration 004 keeps the newest override of each duplicated pair."""
+
+    def test_dedupe_keeps_newest_row(self):
+        path = Path(__file__).resolve().parents[1] / (
+            "alembic/versions/004_unique_coverage_override.py"
+        )
+        spec = importlib.util.spec_from_file_location("migration_004", path)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute(
+            "CREATE TABLE coverage_overrides (id INTEGER PRIMARY KEY,"
+            " institution_id INTEGER, antibiotic_id INTEGER, pathogen_id INTEGER,"
+            " is_covered BOOLEAN)"
+        )
+        conn.executemany(
+            "INSERT INTO coverage_overrides VALUES (?, ?, ?, ?, ?)",
+            [
+                (1, 1, 10, 100, True),
+                (2, 1, 10, 100, False),  # newer duplicate of 1
+                (3, 1, 11, 100, True),
+                (4, 2, 10, 100, True),  # same pair, other institution
+                (5, 1, 10, 100, True),  # newest of 1, 2, 5
+            ],
+        )
+        conn.execute(migration.DEDUPE_OVERRIDES_SQL)
+
+        rows = conn.execute(
+            "SELECT id, is_covered FROM coverage_overrides ORDER BY id"
+        ).fetchall()
+        conn.close()
+        assert rows == [(3, True), (4, True), (5, True)]
+
+
+class TestInstitutionSummary:
+    """GET /api/institutions/{id}/summary."""
+
+    def test_summary_counts_overrides_without_listing_them(self, client, catalog):
+        inst_id = client.post(
+            "/api/institutions", json={"name": "General", "code": "GEN"}
+        ).json()["id"]
+        client.post(f"/api/institutions/{inst_id}/overrides/bulk", json=[
+            {
+                "antibiotic_id": catalog.antibiotics[name].id,
+                "pathogen_id": catalog.pathogen_ids["MRSA"],
+                "is_covered": True,
+            }
+            for name in ("Meropenem", "Vancomycin")
+        ])
+
+        response = client.get(f"/api/institutions/{inst_id}/summary")
+        assert response.status_code == 200
+        assert response.json() == {
+            "id": inst_id, "name": "General", "code": "GEN", "override_count": 2
+        }
+
+    def test_unknown_institution_is_404(self, client):
+        assert client.get("/api/institutions/999999/summary").status_code == 404
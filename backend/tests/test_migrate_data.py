@@ -0,0 +1,63 @@
+"""Unit tests for migrate_data helpers that the SQLite fixture can't reach."""
+
+import csv
+import io
+
+from app.models.antibiotic import AntibioticCoverage, DosageValue
+from scripts.migrate_data import _copy_rows
+
+
+class RecordingCursor:
+    """Stands in for a psycopg2 cursor, keeping what copy_expert was given."""
+
+    def copy_expert(self, sql, file):
+        self.sql = sql
+        self.payload = file.read()
+
+
+class TestCopyRows:
+    """COPY statement and CSV payload built for PostgreSQL bulk loads."""
+
+    def test_columns_follow_first_row_then_defaults(self):
+        cursor = RecordingCursor()
+        _copy_rows(cursor, AntibioticCoverage.__table__, [
+            {"antibiotic_id": 1, "pathogen_id": 2},
+            {"antibiotic_id": 3, "pathogen_id": 4, "is_covered": True},
+        ])
+
+        # is_covered is left out of the rows, so its default (False) is
+        # appended as the last column and filled in where missing
+        assert cursor.sql == (
+            "COPY antibiotic_coverage (antibiotic_id, pathogen_id, is_covered)"
+            " FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        assert cursor.payload == "1,2,False\n3,4,True\n"
+
+    def test_none_is_written_as_null_marker(self):
+        cursor = RecordingCursor()
+        _copy_rows(cursor, DosageValue.__table__, [{
+            "regimen_id": 7,
+            "crcl_range_id": 12,
+            "dose_text": 'Load 2g, then "1g" q8h',
+            "dose_amount": None,
+        }])
+
+        assert cursor.sql == (
+            "COPY dosage_values"
+            " (regimen_id, crcl_range_id, dose_text, dose_amount, is_sequential)"
+            " FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        # Quotes and commas in text survive the round trip
+        assert cursor.payload == '7,12,"Load 2g, then ""1g"" q8h",\\N,False\n'
+        assert next(csv.reader(io.StringIO(cursor.payload))) == [
+            "7", "12", 'Load 2g, then "1g" q8h', "\\N", "False"
+        ]
+
+    def test_empty_string_is_not_null(self):
+        cursor = RecordingCursor()
+        _copy_rows(cursor, DosageValue.__table__, [
+            {"regimen_id": 7, "crcl_range_id": 12, "dose_text": "", "dose_amount": None},
+        ])
+
+        # An empty field no longer matches the NULL marker, so "" loads as ""
+        assert cursor.payload == "7,12,,\\N,False\n"